@@ -3,21 +3,39 @@
 
 Usage:
     uvicorn api:app --reload --host 0.0.0.0 --port 8000
+
+Production:
+    gunicorn api:app -k uvicorn_worker.UvicornWorker -w 4 --bind 0.0.0.0:8000
 """
 
+import asyncio
+import hashlib
 import os
+import re
+import select
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from decimal import Decimal
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
 from dotenv import load_dotenv
 load_dotenv(Path(__file__).parent / ".env")
 
+import anyio
+import anyio.to_thread
+import orjson
 import psycopg2
-from psycopg2.extras import RealDictCursor
+import psycopg2.extensions
+from psycopg2.pool import PoolError, ThreadedConnectionPool
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse as _ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
 
 # Database connection settings
@@ -29,33 +47,645 @@ DB_CONFIG = {
     "password": os.getenv("PGPASSWORD"),
 }
 
+# Comma-separated origins allowed to call the API, e.g.
+# "http://localhost:5173,https://dashboard.example.com". Defaults to any.
+CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "*").split(",") if o.strip()]
+
+# Validate DB rows against the response models before sending (development aid)
+API_DEBUG = os.getenv("API_DEBUG", "").lower() in ("1", "true", "yes")
+
+# Connection pool bounds per worker process. The default max matches the
+# threadpool that runs the sync handlers; lower it when running many
+# Gunicorn workers against a small max_connections.
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "0"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "40"))
+
+# Seconds a borrower waits for a free pooled connection before giving up
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+# Shared connection pool, created per worker process on startup
+db_pool: Optional[ThreadedConnectionPool] = None
+
+# One slot per pooled connection; borrowers queue on it because
+# ThreadedConnectionPool raises instead of waiting when exhausted
+db_pool_slots: Optional[threading.BoundedSemaphore] = None
+
+# Threads that advance streamed response bodies, kept apart from the
+# handler threadpool (see stream_json_rows)
+stream_limiter: Optional[anyio.CapacityLimiter] = None
+
+
+# orjson options shared by responses and models; naive datetimes (e.g. from
+# datetime.utcnow()) are written as UTC
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize the types psycopg2 returns that orjson has no native support for."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ORJSONResponse(_ORJSONResponse):
+    """orjson response that also accepts NUMERIC columns (Decimal) from the database.
+
+    Endpoints return this directly with plain dict rows, which skips FastAPI's
+    response_model validation and jsonable_encoder pass. The response_model on
+    each route is still used for the OpenAPI schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_json_default, option=ORJSON_OPTIONS)
+
+
+# =============================================================================
+# Response Cache
+# =============================================================================
+
+# Seconds a cached GET response stays fresh, by path. First match wins;
+# paths that match nothing (health checks, docs) are never cached.
+# /api/stats is left out: it is cached until the next snapshot instead
+# (see SnapshotListener).
+CACHE_POLICIES: List[Tuple["re.Pattern[str]", float]] = [
+    (re.compile(r"^/api/servers/[^/]+/history$"), 5.0),
+    (re.compile(r"^/api/(frameworks|terrains|clusters|trends/ecosystem)$"), 60.0),
+    (re.compile(r"^/api/(servers|search|leaderboard|activity-patterns)(/.*)?$"), 30.0),
+]
+
+
+class CachedResponse(NamedTuple):
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    expires_at: float
+
+
+class ResponseCache:
+    """In-process store of serialized responses keyed on path + query string.
+
+    clear() starts a new generation; puts made on behalf of a fill that
+    began under an older one are dropped, since its body may predate the
+    data that triggered the clear.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.entries: Dict[str, CachedResponse] = {}
+        self.generation = 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        return self.entries.get(key)
+
+    def put(self, key: str, entry: CachedResponse, generation: Optional[int] = None) -> None:
+        if generation is not None and generation != self.generation:
+            return
+        if key not in self.entries and len(self.entries) >= self.max_entries:
+            now = time.monotonic()
+            for stale_key in [k for k, v in self.entries.items() if v.expires_at <= now]:
+                del self.entries[stale_key]
+            if len(self.entries) >= self.max_entries:
+                del self.entries[next(iter(self.entries))]
+        self.entries[key] = entry
+
+    def clear(self) -> None:
+        self.generation += 1
+        self.entries.clear()
+
+
+response_cache = ResponseCache()
+
+
+class ResponseCacheMiddleware:
+    """Serve repeated GET requests from the response cache.
+
+    Cache hits skip both the SQL and the JSON serialization. Concurrent misses
+    for the same key are single-flighted: one request runs the handler into
+    a buffer and the rest wait for its cached result; each client is then
+    sent its copy outside the lock. When the database is unreachable,
+    the last cached body for the request is served even if it has expired,
+    so the dashboard keeps showing data instead of erroring.
+    """
+
+    def __init__(self, app, cache: ResponseCache, policies=CACHE_POLICIES):
+        self.app = app
+        self.cache = cache
+        self.policies = policies
+        # key -> [lock, number of requests holding or waiting on it]
+        self._inflight: Dict[str, list] = {}
+
+    def _ttl_for(self, path: str) -> Optional[float]:
+        for pattern, ttl in self.policies:
+            if pattern.match(path):
+                return ttl
+        return None
+
+    @staticmethod
+    async def _replay(entry: CachedResponse, send) -> None:
+        await send({"type": "http.response.start", "status": entry.status, "headers": entry.headers})
+        await send({"type": "http.response.body", "body": entry.body})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        ttl = self._ttl_for(scope["path"])
+        if ttl is None:
+            await self.app(scope, receive, send)
+            return
+
+        query = "&".join(sorted(scope["query_string"].decode("latin-1").split("&")))
+        key = f"{scope['path']}?{query}"
+        cached = self.cache.get(key)
+        if cached and cached.expires_at > time.monotonic():
+            await self._replay(cached, send)
+            return
+
+        flight = self._inflight.setdefault(key, [asyncio.Lock(), 0])
+        flight[1] += 1
+        try:
+            async with flight[0]:
+                # Another request may have filled the entry while we waited
+                cached = self.cache.get(key)
+                if not cached or cached.expires_at <= time.monotonic():
+                    cached = await self._fill(scope, key, ttl, cached)
+        finally:
+            flight[1] -= 1
+            if flight[1] == 0:
+                del self._inflight[key]
+        # Sent after the lock is released, so a slow client does not hold
+        # up other requests for the same key
+        await self._replay(cached, send)
+
+    async def _fill(self, scope, key: str, ttl: float, cached: Optional[CachedResponse]) -> CachedResponse:
+        """Run the app for a cache miss and return its buffered response.
+
+        A complete successful response is stored; anything else is returned
+        with an expiry of 0 for this request only.
+        """
+        generation = self.cache.generation
+        status = 0
+        complete = False
+        headers: List[Tuple[bytes, bytes]] = []
+        chunks: List[bytes] = []
+
+        async def capture(message):
+            nonlocal status, headers, complete
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                complete = not message.get("more_body", False)
+
+        requested = False
+
+        async def fill_receive():
+            # The body is produced for every waiter and later hit, so the
+            # filling client going away must not cut it short: a GET has
+            # no request body, and no disconnect is ever reported
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await asyncio.Event().wait()
+
+        try:
+            await self.app(scope, fill_receive, capture)
+        except (psycopg2.OperationalError, PoolError):
+            # Nothing has been sent yet, so a stale body can still stand in
+            if cached is None:
+                raise
+            return cached
+
+        if status != 200 or not complete:
+            return CachedResponse(status, headers, b"".join(chunks), 0.0)
+        entry = CachedResponse(status, headers, b"".join(chunks), time.monotonic() + ttl)
+        self.cache.put(key, entry, generation)
+        return entry
+
+
+# Weak ETag for the data as of the latest ingest run, kept current by
+# SnapshotListener. None until the first refresh succeeds.
+snapshot_etag: Optional[str] = None
+
+
+def _etag_listed(header: str, etag: str) -> bool:
+    """Whether an If-None-Match value matches etag, by weak comparison.
+
+    The header is a comma-separated list of tags, or "*" for any.
+    """
+    opaque = etag.removeprefix("W/")
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+class ETagMiddleware:
+    """Answer conditional API GETs with 304 while no new snapshot has landed.
+
+    Every API response is derived from ingested data, so one version tag
+    (the latest servers.last_seen) is valid for all of them.
+    """
+
+    def __init__(self, app, prefix: str = "/api/", exclude: Tuple[str, ...] = ("/api/health",)):
+        self.app = app
+        self.prefix = prefix
+        self.exclude = exclude
+
+    async def __call__(self, scope, receive, send):
+        etag = snapshot_etag
+        if (
+            etag is None
+            or scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not scope["path"].startswith(self.prefix)
+            or scope["path"] in self.exclude
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        tag_headers = [(b"etag", etag.encode()), (b"cache-control", b"private, max-age=5")]
+        for name, value in scope["headers"]:
+            if name == b"if-none-match" and _etag_listed(value.decode("latin-1"), etag):
+                await send({"type": "http.response.start", "status": 304, "headers": tag_headers})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+        async def tag(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                message = {**message, "headers": list(message.get("headers", [])) + tag_headers}
+            await send(message)
+
+        await self.app(scope, receive, tag)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the connection pool on startup and close it on shutdown."""
+    global db_pool, db_pool_slots, stream_limiter, stats_cache, snapshot_etag
+    # With the default DB_POOL_MIN=0 connections open lazily, so the API
+    # still starts (and /api/health reports 503) while the database is down
+    db_pool = ThreadedConnectionPool(
+        minconn=DB_POOL_MIN,
+        maxconn=DB_POOL_MAX,
+        **DB_CONFIG,
+        connection_factory=PooledConnection,
+        cursor_factory=DictRowCursor,
+    )
+    # Connections are also held outside handler threads (streamed bodies,
+    # the snapshot listener), so borrowers wait on a slot rather than
+    # relying on the thread count to keep the pool from running dry
+    db_pool_slots = threading.BoundedSemaphore(DB_POOL_MAX)
+    stream_limiter = anyio.CapacityLimiter(DB_POOL_MAX)
+    anyio.to_thread.current_default_thread_limiter().total_tokens = DB_POOL_MAX
+    listener = SnapshotListener()
+    listener.start()
+    try:
+        yield
+    finally:
+        listener.stop()
+        db_pool.closeall()
+        db_pool = None
+        stats_cache = None
+        snapshot_etag = None
+
 
 app = FastAPI(
     title="DCS Server Intelligence API",
     description="Real-time analytics and historical trends for DCS World multiplayer servers",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
-# Enable CORS for React frontend
+# Registered before CORS so the CORS middleware wraps them and still adds
+# its headers to cached and 304 responses. ETag checks run before the
+# cache lookup.
+app.add_middleware(ResponseCacheMiddleware, cache=response_cache)
+app.add_middleware(ETagMiddleware)
+
+# Enable CORS for React frontend. The dashboard only issues plain GETs
+# without cookies, so credentials are off and preflights are cached for a day.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=CORS_ORIGINS,
+    allow_credentials=False,
+    allow_methods=["GET"],
+    allow_headers=["content-type"],
+    max_age=86400,
 )
 
 
+# Prepared statements kept per pooled connection before the least recently
+# used one is DEALLOCATEd
+STATEMENT_CACHE_SIZE = 200
+
+
+class PooledConnection(psycopg2.extensions.connection):
+    """psycopg2 connection that remembers which statements its session has PREPAREd."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared: "OrderedDict[str, None]" = OrderedDict()
+
+
+class DictRowCursor(psycopg2.extensions.cursor):
+    """Cursor returning plain dicts, built from the driver's tuples at fetch time.
+
+    Column names are read from the description once per fetch and zipped
+    with each row, rather than RealDictCursor assigning every column of
+    every row from Python.
+    """
+
+    def _keys(self) -> List[str]:
+        return [col[0] for col in self.description]
+
+    def fetchone(self):
+        row = super().fetchone()
+        return None if row is None else dict(zip(self._keys(), row))
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        keys = self._keys() if rows else []
+        return [dict(zip(keys, row)) for row in rows]
+
+    def fetchall(self):
+        rows = super().fetchall()
+        keys = self._keys() if rows else []
+        return [dict(zip(keys, row)) for row in rows]
+
+    def __iter__(self):
+        while True:
+            rows = self.fetchmany(self.itersize)
+            if not rows:
+                return
+            yield from rows
+
+
+def execute_prepared(cur, name: str, sql: str, params: Tuple = ()) -> None:
+    """Run ``sql`` (written with $1, $2, ... placeholders) as a named prepared statement.
+
+    The statement is PREPAREd the first time it is used on a pooled
+    connection; after that only EXECUTE is sent, so PostgreSQL skips
+    parsing and planning.
+    """
+    conn = cur.connection
+    if name in conn.prepared:
+        conn.prepared.move_to_end(name)
+    else:
+        if len(conn.prepared) >= STATEMENT_CACHE_SIZE:
+            oldest, _ = conn.prepared.popitem(last=False)
+            cur.execute(f"DEALLOCATE {oldest}")
+        cur.execute(f"PREPARE {name} AS {sql}")
+        conn.prepared[name] = None
+    if params:
+        cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+    else:
+        cur.execute(f"EXECUTE {name}")
+
+
+def execute_cached(cur, sql: str, params: Tuple = ()) -> None:
+    """execute_prepared with the statement named after its SQL text.
+
+    For queries assembled per request (e.g. a sort column picked from a
+    whitelist): each distinct text gets its own prepared statement.
+    """
+    name = "q_" + hashlib.sha1(sql.encode()).hexdigest()[:16]
+    execute_prepared(cur, name, sql, params)
+
+
+@contextmanager
 def get_db():
-    """Get database connection."""
-    return psycopg2.connect(**DB_CONFIG, cursor_factory=RealDictCursor)
+    """Borrow a pooled database connection for the duration of a request.
+
+    Commits on success and rolls back on error before returning the
+    connection to the pool, so the next borrower starts clean.
+    """
+    conn = acquire_db()
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        if not conn.closed:
+            conn.rollback()
+        raise
+    finally:
+        release_db(conn)
+
+
+def acquire_db():
+    """Borrow a connection from the pool, waiting while all of them are in use.
+
+    Raises PoolError after DB_POOL_TIMEOUT seconds without a free one.
+    """
+    if not db_pool_slots.acquire(timeout=DB_POOL_TIMEOUT):
+        raise PoolError("timed out waiting for a pooled connection")
+    try:
+        return db_pool.getconn()
+    except Exception:
+        db_pool_slots.release()
+        raise
+
+
+def release_db(conn) -> None:
+    """Return a connection to the pool, discarding it if the session died.
+
+    After a database restart or dropped socket the connection is closed;
+    putting it back would hand a dead connection to the next request.
+    """
+    try:
+        db_pool.putconn(conn, close=bool(conn.closed))
+    finally:
+        db_pool_slots.release()
+
+
+def stream_json_rows(
+    query: str,
+    params,
+    batch_size: int = 100,
+    adapter: Optional[TypeAdapter] = None,
+    prebuilt: bool = False,
+    row_type: Optional[type] = None,
+    prepared: bool = False,
+) -> StreamingResponse:
+    """Stream query results as a JSON array, fetched in batches from a server-side cursor.
+
+    The query is sent before returning, so connection errors still surface
+    from the handler (and reach the stale-cache fallback). Each batch is
+    encoded as soon as it arrives, instead of holding every row and the
+    whole body in memory at once.
+
+    With prebuilt=True the query selects a single JSON text column per row,
+    which is written out as-is without decoding or re-encoding. With
+    row_type, tuple rows are passed positionally to it (e.g. a dataclass).
+
+    With prepared=True the query (written with $n placeholders) goes through
+    execute_cached on a client-side cursor instead: a cursor cannot be
+    DECLAREd over an EXECUTE, so this suits bounded results that benefit
+    more from plan reuse than from server-side batching.
+
+    The connection is held until the body finishes, after the handler's
+    thread is gone, so the body is advanced on stream_limiter's threads:
+    it must not queue behind handlers that are waiting for a connection.
+    """
+    conn = acquire_db()
+    try:
+        tuples = prebuilt or row_type is not None
+        factory = {"cursor_factory": psycopg2.extensions.cursor} if tuples else {}
+        if prepared:
+            cur = conn.cursor(**factory)
+            execute_cached(cur, query, params)
+        else:
+            cur = conn.cursor(name="stream_json_rows", **factory)
+            cur.execute(query, params)
+        first = cur.fetchmany(batch_size)
+    except Exception:
+        if not conn.closed:
+            conn.rollback()
+        release_db(conn)
+        raise
+
+    def body() -> Iterator[bytes]:
+        rows = first
+        yield b"["
+        sep = b""
+        while rows:
+            if prebuilt:
+                chunk = ",".join(row[0] for row in rows).encode()
+                if adapter is not None and API_DEBUG:
+                    checked(adapter, orjson.loads(b"[" + chunk + b"]"))
+            else:
+                if row_type is not None:
+                    rows = [row_type(*row) for row in rows]
+                if adapter is not None:
+                    checked(adapter, rows)
+                # Encode the batch as one array and drop its brackets
+                chunk = orjson.dumps(rows, default=_json_default, option=ORJSON_OPTIONS)[1:-1]
+            yield sep + chunk
+            sep = b","
+            rows = cur.fetchmany(batch_size)
+        yield b"]"
+
+    def finish() -> None:
+        if not conn.closed:
+            cur.close()
+            conn.rollback()
+        release_db(conn)
+
+    async def stream() -> AsyncIterator[bytes]:
+        chunks = body()
+        try:
+            while True:
+                chunk = await anyio.to_thread.run_sync(next, chunks, None, limiter=stream_limiter)
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            # Runs even when the client went away mid-body
+            with anyio.CancelScope(shield=True):
+                await anyio.to_thread.run_sync(finish, limiter=stream_limiter)
+
+    return StreamingResponse(stream(), media_type="application/json")
+
+
+# =============================================================================
+# Snapshot Listener
+# =============================================================================
+
+# Channel ingest_servers.py notifies after committing a run
+SNAPSHOT_CHANNEL = "snapshot_done"
+
+# Serialized /api/stats body, rebuilt whenever a new snapshot lands
+stats_cache: Optional[bytes] = None
+
+
+def build_snapshot_state() -> Tuple[Optional[str], bytes]:
+    """Fetch the data version tag and the serialized ecosystem stats in one round trip.
+
+    The tag is the time of the latest ingest run (MAX(servers.last_seen)).
+    """
+    with get_db() as conn:
+        with conn.cursor() as cur:
+            execute_prepared(cur, "snapshot_state", SNAPSHOT_STATE_SQL)
+            row = cur.fetchone()
+    ts = row.pop("snapshot_ts")
+    etag = f'W/"{ts}"' if ts is not None else None
+    return etag, orjson.dumps(checked(ECOSYSTEM_STATS_ADAPTER, row), default=_json_default, option=ORJSON_OPTIONS)
+
+
+class SnapshotListener(threading.Thread):
+    """Background thread that LISTENs for new snapshots and refreshes caches.
+
+    Uses its own autocommit connection outside the pool, since a LISTEN
+    only holds while the session stays open. On each notification the
+    stats body and ETag are rebuilt and the response cache is cleared.
+    """
+
+    def __init__(self, channel: str = SNAPSHOT_CHANNEL, poll_seconds: float = 5.0):
+        super().__init__(name="snapshot-listener", daemon=True)
+        self.channel = channel
+        self.poll_seconds = poll_seconds
+        self._stopping = threading.Event()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self.join(timeout=self.poll_seconds + 1)
+
+    def refresh(self) -> None:
+        global stats_cache, snapshot_etag
+        etag, stats_cache = build_snapshot_state()
+        # Clearing starts a new cache generation, so fills still running on
+        # pre-ingest data are not stored; the tag is published last, so no
+        # body cached from the old data is served under the new tag
+        response_cache.clear()
+        snapshot_etag = etag
+
+    def listen(self) -> None:
+        conn = psycopg2.connect(**DB_CONFIG)
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {self.channel}")
+            # Anything ingested while we were not listening is picked up here
+            self.refresh()
+            while not self._stopping.is_set():
+                if select.select([conn], [], [], self.poll_seconds) == ([], [], []):
+                    continue
+                conn.poll()
+                if conn.notifies:
+                    conn.notifies.clear()
+                    self.refresh()
+        finally:
+            conn.close()
+
+    def run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                self.listen()
+            except (psycopg2.Error, PoolError) as e:
+                print(f"Snapshot listener error, reconnecting: {e}")
+                self._stopping.wait(self.poll_seconds)
 
 
 # =============================================================================
 # Pydantic Models
 # =============================================================================
 
-class EcosystemStats(BaseModel):
+class ORJSONModel(BaseModel):
+    """Base model that builds from DB rows or objects and serializes with orjson."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    def model_dump_json(self, **kwargs) -> str:
+        option = ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if kwargs.pop("indent", None) else 0)
+        return orjson.dumps(self.model_dump(**kwargs), default=_json_default, option=option).decode()
+
+
+class EcosystemStats(ORJSONModel):
     total_servers: int
     active_servers: int
     total_players: int
@@ -71,7 +701,7 @@ class EcosystemStats(BaseModel):
     captured_at: Optional[datetime]
 
 
-class ServerSummary(BaseModel):
+class ServerSummary(ORJSONModel):
     id: str
     server_name: str
     ip_address: str
@@ -116,7 +746,12 @@ class ServerDetail(ServerSummary):
     host_cluster_id: Optional[str]
 
 
-class ServerSnapshot(BaseModel):
+# Plain slotted dataclasses for shapes only ever built from our own query
+# rows: constructed positionally from tuple rows (field order matches the
+# SELECT list) and serialized by orjson natively
+
+@dataclass(slots=True)
+class ServerSnapshot:
     captured_at: datetime
     players_current: int
     players_max: Optional[int]
@@ -125,7 +760,7 @@ class ServerSnapshot(BaseModel):
     ping_ms: Optional[float]
 
 
-class HostCluster(BaseModel):
+class HostCluster(ORJSONModel):
     id: str
     ip_address: str
     server_count: int
@@ -133,84 +768,102 @@ class HostCluster(BaseModel):
     servers: Optional[List[ServerSummary]]
 
 
-class FrameworkStat(BaseModel):
+@dataclass(slots=True)
+class FrameworkStat:
     name: str
     count: int
     total_players: int
     avg_players: float
 
 
-class TerrainStat(BaseModel):
+@dataclass(slots=True)
+class TerrainStat:
     name: str
     count: int
     total_players: int
 
 
+# Built once at import; endpoints send rows straight to orjson and only run
+# them through these when API_DEBUG is set
+ECOSYSTEM_STATS_ADAPTER = TypeAdapter(EcosystemStats)
+SERVER_LIST_ADAPTER = TypeAdapter(List[ServerSummary])
+SERVER_DETAIL_ADAPTER = TypeAdapter(ServerDetail)
+SNAPSHOT_LIST_ADAPTER = TypeAdapter(List[ServerSnapshot])
+CLUSTER_LIST_ADAPTER = TypeAdapter(List[HostCluster])
+FRAMEWORK_LIST_ADAPTER = TypeAdapter(List[FrameworkStat])
+TERRAIN_LIST_ADAPTER = TypeAdapter(List[TerrainStat])
+
+
+def checked(adapter: TypeAdapter, content: Any) -> Any:
+    """Return content unchanged, validating it against adapter first when API_DEBUG is set."""
+    if API_DEBUG:
+        adapter.validate_python(content)
+    return content
+
+
 # =============================================================================
 # API Endpoints
 # =============================================================================
 
-@app.get("/api/stats", response_model=EcosystemStats, tags=["Overview"])
-def get_ecosystem_stats():
-    """Get current ecosystem-wide statistics."""
-    with get_db() as conn:
-        with conn.cursor() as cur:
-            # Try to get from ecosystem_stats table first
-            cur.execute("""
-                SELECT * FROM ecosystem_stats
-                ORDER BY captured_at DESC
-                LIMIT 1
-            """)
-            row = cur.fetchone()
+# Latest recorded ecosystem_stats row, or live aggregates over servers when
+# none has been recorded yet. The fallback branch sits behind a one-time
+# NOT EXISTS filter, so PostgreSQL only scans servers when it is needed.
+ECOSYSTEM_STATS_SQL = """
+    WITH latest AS (
+        SELECT
+            total_servers, active_servers, total_players, peak_concurrent,
+            solo_sessions, multiplayer_sessions, unique_hosts,
+            discord_linked, srs_enabled, password_protected,
+            framework_counts, terrain_counts, captured_at
+        FROM ecosystem_stats
+        ORDER BY captured_at DESC
+        LIMIT 1
+    )
+    SELECT * FROM latest
+    UNION ALL
+    SELECT * FROM (
+        SELECT
+            COUNT(*) as total_servers,
+            COUNT(*) FILTER (WHERE players_current > 0) as active_servers,
+            COALESCE(SUM(players_current), 0) as total_players,
+            NULL::integer as peak_concurrent,
+            COUNT(*) FILTER (WHERE players_current = 1) as solo_sessions,
+            COUNT(*) FILTER (WHERE players_current > 1) as multiplayer_sessions,
+            COUNT(DISTINCT ip_address) as unique_hosts,
+            COUNT(*) FILTER (WHERE discord_url IS NOT NULL) as discord_linked,
+            COUNT(*) FILTER (WHERE srs_address IS NOT NULL) as srs_enabled,
+            COUNT(*) FILTER (WHERE password_required = true) as password_protected,
+            (SELECT jsonb_object_agg(framework, cnt) FROM (
+                SELECT framework, COUNT(*) as cnt FROM servers
+                WHERE framework IS NOT NULL GROUP BY framework
+            ) f) as framework_counts,
+            (SELECT jsonb_object_agg(terrain, cnt) FROM (
+                SELECT terrain, COUNT(*) as cnt FROM servers
+                WHERE terrain IS NOT NULL GROUP BY terrain
+            ) t) as terrain_counts,
+            NOW() as captured_at
+        FROM servers
+    ) live
+    WHERE NOT EXISTS (SELECT 1 FROM latest)
+    LIMIT 1
+"""
 
-            if row:
-                return EcosystemStats(
-                    total_servers=row["total_servers"] or 0,
-                    active_servers=row["active_servers"] or 0,
-                    total_players=row["total_players"] or 0,
-                    peak_concurrent=row["peak_concurrent"],
-                    solo_sessions=row["solo_sessions"] or 0,
-                    multiplayer_sessions=row["multiplayer_sessions"] or 0,
-                    unique_hosts=row["unique_hosts"] or 0,
-                    discord_linked=row["discord_linked"] or 0,
-                    srs_enabled=row["srs_enabled"] or 0,
-                    password_protected=row["password_protected"] or 0,
-                    framework_counts=row["framework_counts"],
-                    terrain_counts=row["terrain_counts"],
-                    captured_at=row["captured_at"],
-                )
+# Stats plus the data version the ETag is derived from, as one statement
+SNAPSHOT_STATE_SQL = f"""
+    SELECT
+        stats.*,
+        (SELECT EXTRACT(EPOCH FROM MAX(last_seen))::bigint FROM servers) as snapshot_ts
+    FROM ({ECOSYSTEM_STATS_SQL}) stats
+"""
 
-            # Fallback: compute from servers table
-            cur.execute("""
-                SELECT
-                    COUNT(*) as total_servers,
-                    COUNT(*) FILTER (WHERE players_current > 0) as active_servers,
-                    COALESCE(SUM(players_current), 0) as total_players,
-                    COUNT(*) FILTER (WHERE players_current = 1) as solo_sessions,
-                    COUNT(*) FILTER (WHERE players_current > 1) as multiplayer_sessions,
-                    COUNT(DISTINCT ip_address) as unique_hosts,
-                    COUNT(*) FILTER (WHERE discord_url IS NOT NULL) as discord_linked,
-                    COUNT(*) FILTER (WHERE srs_address IS NOT NULL) as srs_enabled,
-                    COUNT(*) FILTER (WHERE password_required = true) as password_protected
-                FROM servers
-            """)
-            row = cur.fetchone()
 
-            return EcosystemStats(
-                total_servers=row["total_servers"],
-                active_servers=row["active_servers"],
-                total_players=row["total_players"],
-                peak_concurrent=None,
-                solo_sessions=row["solo_sessions"],
-                multiplayer_sessions=row["multiplayer_sessions"],
-                unique_hosts=row["unique_hosts"],
-                discord_linked=row["discord_linked"],
-                srs_enabled=row["srs_enabled"],
-                password_protected=row["password_protected"],
-                framework_counts=None,
-                terrain_counts=None,
-                captured_at=datetime.utcnow(),
-            )
+@app.get("/api/stats", response_model=EcosystemStats, tags=["Overview"])
+def get_ecosystem_stats():
+    """Get current ecosystem-wide statistics."""
+    global stats_cache
+    if stats_cache is None:
+        _, stats_cache = build_snapshot_state()
+    return Response(stats_cache, media_type="application/json")
 
 
 @app.get("/api/servers", response_model=List[ServerSummary], tags=["Servers"])
@@ -230,34 +883,35 @@ def get_servers(
     offset: int = Query(0, ge=0, description="Offset for pagination"),
 ):
     """Get list of servers with filtering and sorting."""
+    # Placeholders are numbered in a fixed order, so each combination of
+    # filters and sort produces the same SQL text and reuses one prepared
+    # statement (see execute_cached)
     conditions = []
     params = []
 
+    def arg(value) -> str:
+        params.append(value)
+        return f"${len(params)}"
+
     if terrain:
-        conditions.append("terrain = %s")
-        params.append(terrain)
+        conditions.append(f"terrain = {arg(terrain)}")
     if framework:
-        conditions.append("framework = %s")
-        params.append(framework)
+        conditions.append(f"framework = {arg(framework)}")
     if game_mode:
-        conditions.append("game_mode = %s")
-        params.append(game_mode)
+        conditions.append(f"game_mode = {arg(game_mode)}")
     if era:
-        conditions.append("era = %s")
-        params.append(era)
+        conditions.append(f"era = {arg(era)}")
     if search:
-        conditions.append("(server_name ILIKE %s OR description ILIKE %s)")
-        params.extend([f"%{search}%", f"%{search}%"])
+        pattern = arg(f"%{search}%")
+        conditions.append(f"(server_name ILIKE {pattern} OR description ILIKE {pattern})")
     if min_players is not None:
-        conditions.append("players_current >= %s")
-        params.append(min_players)
+        conditions.append(f"players_current >= {arg(min_players)}")
     if has_discord is not None:
         conditions.append("discord_url IS NOT NULL" if has_discord else "discord_url IS NULL")
     if has_srs is not None:
         conditions.append("srs_address IS NOT NULL" if has_srs else "srs_address IS NULL")
     if has_password is not None:
-        conditions.append("password_required = %s")
-        params.append(has_password)
+        conditions.append(f"password_required = {arg(has_password)}::bool")
 
     where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
 
@@ -275,26 +929,17 @@ def get_servers(
     # Handle NULLs in sorting
     null_order = "NULLS LAST" if order.lower() == "desc" else "NULLS FIRST"
 
+    # summary_json is kept in sync by a trigger on servers (see schema.sql),
+    # so each row is already the serialized ServerSummary
     query = f"""
-            SELECT
-                id::text, server_name, ip_address::text, port,
-                players_current, players_max, password_required,
-                terrain, era, game_mode, framework, ping_ms,
-                discord_url, srs_address, mission, dcs_version,
-                trend_7d, health_score, last_seen
+            SELECT summary_json::text
             FROM servers
         {where_clause}
         ORDER BY {sort_col} {order_dir} {null_order}
-        LIMIT %s OFFSET %s
+        LIMIT {arg(limit)} OFFSET {arg(offset)}
     """
-    params.extend([limit, offset])
-
-    with get_db() as conn:
-        with conn.cursor() as cur:
-            cur.execute(query, params)
-            rows = cur.fetchall()
 
-    return [ServerSummary(**row) for row in rows]
+    return stream_json_rows(query, tuple(params), adapter=SERVER_LIST_ADAPTER, prebuilt=True, prepared=True)
 
 
 @app.get("/api/servers/{server_id}", response_model=ServerDetail, tags=["Servers"])
@@ -302,7 +947,7 @@ def get_server(server_id: str):
     """Get detailed information for a specific server."""
     with get_db() as conn:
         with conn.cursor() as cur:
-            cur.execute("""
+            execute_prepared(cur, "server_detail", """
                 SELECT
                     id::text, server_name, ip_address::text, port,
                     players_current, players_max, password_required,
@@ -318,64 +963,84 @@ def get_server(server_id: str):
                     first_seen, rank, rank_change, tags,
                     host_cluster_id::text
                 FROM servers
-                WHERE id = %s::uuid
+                WHERE id = $1::uuid
             """, (server_id,))
             row = cur.fetchone()
 
             if not row:
                 raise HTTPException(status_code=404, detail="Server not found")
 
-            return ServerDetail(**row)
+    return ORJSONResponse(checked(SERVER_DETAIL_ADAPTER, row))
 
 
 @app.get("/api/servers/{server_id}/history", response_model=List[ServerSnapshot], tags=["Servers"])
 def get_server_history(
     server_id: str,
     hours: int = Query(24, ge=1, le=168, description="Hours of history (max 168 = 7 days)"),
+    layout: str = Query("rows", description="rows: one object per snapshot; columns: one array per field"),
 ):
-    """Get player count history for a server."""
+    """Get player count history for a server.
+
+    With layout=columns the snapshots come back as parallel arrays keyed by
+    field name, which chart libraries can consume without reshaping.
+    """
+    if layout not in ("rows", "columns"):
+        raise HTTPException(status_code=400, detail="Invalid layout. Use: ['rows', 'columns']")
+
+    query = """
+        SELECT
+            captured_at, players_current, players_max, mission, is_online, ping_ms
+        FROM server_snapshots
+        WHERE server_id = %s::uuid
+          AND captured_at > NOW() - make_interval(hours => %s)
+        ORDER BY captured_at ASC
+    """
+
+    if layout == "rows":
+        # Rows map positionally onto ServerSnapshot and are streamed in
+        # batches, so long histories are never held in memory all at once
+        return stream_json_rows(
+            query, (server_id, hours),
+            batch_size=1000, adapter=SNAPSHOT_LIST_ADAPTER, row_type=ServerSnapshot,
+        )
+
     with get_db() as conn:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT
-                    captured_at, players_current, players_max, mission, is_online, ping_ms
-                FROM server_snapshots
-                WHERE server_id = %s::uuid
-                  AND captured_at > NOW() - INTERVAL '%s hours'
-                ORDER BY captured_at ASC
-            """, (server_id, hours))
+        with conn.cursor(cursor_factory=psycopg2.extensions.cursor) as cur:
+            cur.execute(query, (server_id, hours))
+            columns = [col[0] for col in cur.description]
             rows = cur.fetchall()
 
-    return [ServerSnapshot(**row) for row in rows]
+    values = list(zip(*rows)) if rows else [()] * len(columns)
+    return ORJSONResponse({col: list(vals) for col, vals in zip(columns, values)})
 
 
 @app.get("/api/frameworks", response_model=List[FrameworkStat], tags=["Analytics"])
 def get_framework_stats():
     """Get framework distribution with player counts."""
     with get_db() as conn:
-        with conn.cursor() as cur:
-            cur.execute("""
+        with conn.cursor(cursor_factory=psycopg2.extensions.cursor) as cur:
+            execute_prepared(cur, "framework_stats", """
                 SELECT
                     framework as name,
                     COUNT(*) as count,
                     COALESCE(SUM(players_current), 0) as total_players,
-                    ROUND(AVG(players_current)::numeric, 2) as avg_players
+                    ROUND(AVG(players_current), 2)::float8 as avg_players
                 FROM servers
                 WHERE framework IS NOT NULL
                 GROUP BY framework
                 ORDER BY count DESC
             """)
-            rows = cur.fetchall()
+            rows = [FrameworkStat(*row) for row in cur.fetchall()]
 
-    return [FrameworkStat(**row) for row in rows]
+    return ORJSONResponse(checked(FRAMEWORK_LIST_ADAPTER, rows))
 
 
 @app.get("/api/terrains", response_model=List[TerrainStat], tags=["Analytics"])
 def get_terrain_stats():
     """Get terrain distribution with player counts."""
     with get_db() as conn:
-        with conn.cursor() as cur:
-            cur.execute("""
+        with conn.cursor(cursor_factory=psycopg2.extensions.cursor) as cur:
+            execute_prepared(cur, "terrain_stats", """
                 SELECT
                     terrain as name,
                     COUNT(*) as count,
@@ -385,9 +1050,9 @@ def get_terrain_stats():
                 GROUP BY terrain
                 ORDER BY count DESC
             """)
-            rows = cur.fetchall()
+            rows = [TerrainStat(*row) for row in cur.fetchall()]
 
-    return [TerrainStat(**row) for row in rows]
+    return ORJSONResponse(checked(TERRAIN_LIST_ADAPTER, rows))
 
 
 @app.get("/api/clusters", response_model=List[HostCluster], tags=["Analytics"])
@@ -399,37 +1064,30 @@ def get_host_clusters(
     """Get host clusters (IPs running multiple servers)."""
     with get_db() as conn:
         with conn.cursor() as cur:
-            cur.execute("""
-                SELECT id::text, ip_address::text, server_count, organization_name
-                FROM host_clusters
-                WHERE server_count >= %s
-                ORDER BY server_count DESC
-                LIMIT %s
-            """, (min_servers, limit))
+            # One round trip: each cluster's servers are aggregated from the
+            # stored summary_json payloads, only for the clusters returned
+            execute_prepared(cur, "host_clusters", """
+                SELECT
+                    hc.id::text, hc.ip_address::text, hc.server_count, hc.organization_name,
+                    CASE WHEN $3::bool THEN (
+                        SELECT COALESCE(jsonb_agg(s.summary_json ORDER BY s.players_current DESC), '[]'::jsonb)::text
+                        FROM servers s
+                        WHERE s.host_cluster_id = hc.id
+                    ) END as servers
+                FROM host_clusters hc
+                WHERE hc.server_count >= $1
+                ORDER BY hc.server_count DESC
+                LIMIT $2
+            """, (min_servers, limit, include_servers))
             clusters = cur.fetchall()
 
-            result = []
-            for cluster in clusters:
-                cluster_data = dict(cluster)
-                cluster_data["servers"] = None
+    # Embed the server lists as-is; decode them only when they are validated
+    embed = orjson.loads if API_DEBUG else orjson.Fragment
+    for cluster in clusters:
+        if cluster["servers"] is not None:
+            cluster["servers"] = embed(cluster["servers"])
 
-                if include_servers:
-                    cur.execute("""
-                        SELECT
-                            id::text, server_name, ip_address::text, port,
-                            players_current, players_max, password_required,
-                            terrain, era, game_mode, framework, ping_ms,
-                            discord_url, srs_address, mission, dcs_version,
-                            trend_7d, health_score, last_seen
-                        FROM servers
-                        WHERE host_cluster_id = %s::uuid
-                        ORDER BY players_current DESC
-                    """, (cluster["id"],))
-                    cluster_data["servers"] = [ServerSummary(**s) for s in cur.fetchall()]
-
-                result.append(HostCluster(**cluster_data))
-
-    return result
+    return ORJSONResponse(checked(CLUSTER_LIST_ADAPTER, clusters))
 
 
 @app.get("/api/trends/ecosystem", tags=["Trends"])
@@ -440,7 +1098,7 @@ def get_ecosystem_trends(
     with get_db() as conn:
         with conn.cursor() as cur:
             # Get actual concurrent players from server_snapshots, aggregated by day
-            cur.execute("""
+            execute_prepared(cur, "ecosystem_trends", """
                 WITH daily_snapshots AS (
                     SELECT
                         DATE(captured_at) as stat_date,
@@ -450,16 +1108,16 @@ def get_ecosystem_trends(
                         COUNT(*) FILTER (WHERE players_current > 0) as active_servers,
                         COUNT(*) FILTER (WHERE players_current > 1) as multiplayer_sessions
                     FROM server_snapshots
-                    WHERE captured_at > NOW() - INTERVAL '%s days'
+                    WHERE captured_at > NOW() - make_interval(days => $1::int)
                     GROUP BY DATE(captured_at), captured_at
                 ),
                 daily_stats AS (
                     SELECT
                         stat_date,
-                        ROUND(AVG(total_players)) as avg_players,
-                        MAX(total_players) as peak_players,
-                        ROUND(AVG(active_servers)) as avg_active_servers,
-                        ROUND(AVG(multiplayer_sessions)) as avg_multiplayer
+                        ROUND(AVG(total_players))::int as avg_players,
+                        MAX(total_players)::int as peak_players,
+                        ROUND(AVG(active_servers))::int as avg_active_servers,
+                        ROUND(AVG(multiplayer_sessions))::int as avg_multiplayer
                     FROM daily_snapshots
                     GROUP BY stat_date
                 )
@@ -474,7 +1132,7 @@ def get_ecosystem_trends(
             """, (days,))
             rows = cur.fetchall()
 
-    return [dict(row) for row in rows]
+    return ORJSONResponse(rows)
 
 
 @app.get("/api/leaderboard", response_model=List[ServerSummary], tags=["Analytics"])
@@ -495,23 +1153,16 @@ def get_leaderboard(
 
     sort_col = metric_map[metric]
 
-    with get_db() as conn:
-        with conn.cursor() as cur:
-            cur.execute(f"""
-                SELECT
-                    id::text, server_name, ip_address::text, port,
-                    players_current, players_max, password_required,
-                    terrain, era, game_mode, framework, ping_ms,
-                    discord_url, srs_address, mission, dcs_version,
-                    trend_7d, health_score, last_seen
-                FROM servers
-                WHERE {sort_col} IS NOT NULL
-                ORDER BY {sort_col} DESC NULLS LAST
-                LIMIT %s
-            """, (limit,))
-            rows = cur.fetchall()
+    # Same trigger-maintained summary_json projection as /api/servers
+    query = f"""
+        SELECT summary_json::text
+        FROM servers
+        WHERE {sort_col} IS NOT NULL
+        ORDER BY {sort_col} DESC NULLS LAST
+        LIMIT $1
+    """
 
-    return [ServerSummary(**row) for row in rows]
+    return stream_json_rows(query, (limit,), adapter=SERVER_LIST_ADAPTER, prebuilt=True, prepared=True)
 
 
 @app.get("/api/search", response_model=List[ServerSummary], tags=["Servers"])
@@ -520,35 +1171,25 @@ def search_servers(
     limit: int = Query(20, ge=1, le=100, description="Max results"),
 ):
     """Full-text search across server names and descriptions."""
-    with get_db() as conn:
-        with conn.cursor() as cur:
-            # Use PostgreSQL full-text search with fallback to ILIKE
-            cur.execute("""
-                SELECT
-                    id::text, server_name, ip_address::text, port,
-                    players_current, players_max, password_required,
-                    terrain, era, game_mode, framework, ping_ms,
-                    discord_url, srs_address, mission, dcs_version,
-                    trend_7d, health_score, last_seen,
-                    ts_rank(
-                        to_tsvector('english', server_name || ' ' || COALESCE(description, '')),
-                        plainto_tsquery('english', %s)
-                    ) as rank
-                FROM servers
-                WHERE
-                    to_tsvector('english', server_name || ' ' || COALESCE(description, '')) @@ plainto_tsquery('english', %s)
-                    OR server_name ILIKE %s
-                    OR description ILIKE %s
-                ORDER BY rank DESC, players_current DESC
-                LIMIT %s
-            """, (q, q, f"%{q}%", f"%{q}%", limit))
-            rows = cur.fetchall()
+    # Use PostgreSQL full-text search with fallback to ILIKE. Rank is only
+    # used for ordering, so it is not part of the projection
+    query = """
+        SELECT summary_json::text
+        FROM servers
+        WHERE
+            search_tsv @@ plainto_tsquery('english', $1::text)
+            OR server_name ILIKE $2::text
+            OR description ILIKE $2::text
+        ORDER BY
+            ts_rank(search_tsv, plainto_tsquery('english', $1::text)) DESC,
+            players_current DESC
+        LIMIT $3
+    """
 
-    # Remove rank from results
-    return [ServerSummary(**{k: v for k, v in row.items() if k != "rank"}) for row in rows]
+    return stream_json_rows(query, (q, f"%{q}%", limit), adapter=SERVER_LIST_ADAPTER, prebuilt=True, prepared=True)
 
 
-class ActivityPattern(BaseModel):
+class ActivityPattern(ORJSONModel):
     server_id: str
     server_name: str
     password_required: bool
@@ -559,7 +1200,7 @@ class ActivityPattern(BaseModel):
     sample_count: int
 
 
-class ServerActivitySummary(BaseModel):
+class ServerActivitySummary(ORJSONModel):
     server_id: str
     server_name: str
     password_required: bool
@@ -575,6 +1216,9 @@ class ServerActivitySummary(BaseModel):
     training_score: float  # peak_avg / off_peak_avg - high score with low off_peak = training server
 
 
+ACTIVITY_LIST_ADAPTER = TypeAdapter(List[ServerActivitySummary])
+
+
 @app.get("/api/activity-patterns", response_model=List[ServerActivitySummary], tags=["Analytics"])
 def get_activity_patterns(
     min_samples: int = Query(5, ge=1, description="Minimum snapshots required"),
@@ -603,142 +1247,64 @@ def get_activity_patterns(
     - training_ratio: peak_window_avg / baseline (relative spike, works for any squad size)
     - hot_slots: Hours where avg > baseline × 3 (concentrated activity)
     """
+    # Only the filters the caller supplied become predicates, numbered in a
+    # fixed order so each combination reuses one prepared statement
+    params = []
+
+    def arg(value) -> str:
+        params.append(value)
+        return f"${len(params)}"
+
+    conditions = [f"total_samples >= {arg(min_samples)}"]
+    if password_only:
+        conditions.append("password_required = true")
+    if peak_day is not None:
+        conditions.append(f"peak_day = {arg(peak_day)}")
+    if peak_hour_start is not None and peak_hour_end is not None:
+        conditions.append(f"peak_hour BETWEEN {arg(peak_hour_start)} AND {arg(peak_hour_end)}")
+    if max_active_hours is not None:
+        conditions.append(f"active_hours <= {arg(max_active_hours)}")
+    if training_mode:
+        conditions.append("baseline <= 1 AND training_ratio >= 3")
+    if max_baseline is not None:
+        conditions.append(f"baseline <= {arg(max_baseline)}")
+    if min_training_ratio is not None:
+        conditions.append(f"training_ratio >= {arg(min_training_ratio)}")
+
+    # Qualified, so these sort on the unrounded view columns
+    order_by = "sas.activity_score DESC NULLS LAST, sas.peak_avg_players DESC"
+    if training_mode:
+        order_by = "sas.training_ratio DESC NULLS LAST, " + order_by
+
     with get_db() as conn:
         with conn.cursor() as cur:
-            # Get activity patterns aggregated by server, day of week, and hour
-            # Convert to Eastern Time for analysis
-            cur.execute("""
-                WITH hourly_activity AS (
-                    SELECT
-                        ss.server_id,
-                        s.server_name,
-                        s.password_required,
-                        s.terrain,
-                        s.framework,
-                        EXTRACT(DOW FROM ss.captured_at AT TIME ZONE 'America/New_York')::int as dow,
-                        EXTRACT(HOUR FROM ss.captured_at AT TIME ZONE 'America/New_York')::int as hour_et,
-                        AVG(ss.players_current) as avg_players,
-                        MAX(ss.players_current) as max_players,
-                        COUNT(*) as samples
-                    FROM server_snapshots ss
-                    JOIN servers s ON s.id = ss.server_id
-                    WHERE ss.players_current >= 0
-                    GROUP BY ss.server_id, s.server_name, s.password_required, s.terrain, s.framework,
-                             EXTRACT(DOW FROM ss.captured_at AT TIME ZONE 'America/New_York'),
-                             EXTRACT(HOUR FROM ss.captured_at AT TIME ZONE 'America/New_York')
-                    HAVING COUNT(*) >= 1
-                ),
-                server_stats AS (
-                    SELECT
-                        server_id,
-                        server_name,
-                        password_required,
-                        terrain,
-                        framework,
-                        SUM(samples) as total_samples,
-                        COUNT(DISTINCT (dow, hour_et)) as active_hours,
-                        -- Find peak hour
-                        (ARRAY_AGG(dow ORDER BY avg_players DESC))[1] as peak_day,
-                        (ARRAY_AGG(hour_et ORDER BY avg_players DESC))[1] as peak_hour,
-                        MAX(avg_players) as peak_avg_players,
-                        AVG(avg_players) as overall_avg,
-                        -- Baseline: 25th percentile (server's "normal" state - dead/bot)
-                        PERCENTILE_CONT(0.25) WITHIN GROUP (ORDER BY avg_players) as baseline,
-                        -- Collect all hourly data for peak window calculation
-                        ARRAY_AGG(ROW(dow, hour_et, avg_players)) as hourly_data
-                    FROM hourly_activity
-                    GROUP BY server_id, server_name, password_required, terrain, framework
-                    HAVING SUM(samples) >= %s
-                ),
-                server_summary AS (
-                    SELECT
-                        ss.server_id,
-                        ss.server_name,
-                        ss.password_required,
-                        ss.terrain,
-                        ss.framework,
-                        ss.total_samples,
-                        ss.active_hours,
-                        ss.peak_day,
-                        ss.peak_hour,
-                        ss.peak_avg_players,
-                        ss.overall_avg,
-                        ss.baseline,
-                        -- Activity concentration score
-                        ss.peak_avg_players / NULLIF(ss.overall_avg, 0) as activity_score,
-                        -- Peak window average: peak hour ±2 hours on peak day
-                        COALESCE(
-                            (SELECT AVG(ha.avg_players)
-                             FROM hourly_activity ha
-                             WHERE ha.server_id = ss.server_id
-                               AND ha.dow = ss.peak_day
-                               AND ha.hour_et BETWEEN ss.peak_hour - 2 AND ss.peak_hour + 2),
-                            ss.peak_avg_players
-                        ) as peak_window_avg,
-                        -- Hot slots: hours where avg > baseline × 3 (relative threshold)
-                        (SELECT COUNT(*)
-                         FROM hourly_activity ha
-                         WHERE ha.server_id = ss.server_id
-                           AND ha.avg_players > GREATEST(ss.baseline * 3, 2)
-                        ) as hot_slots
-                    FROM server_stats ss
-                )
+            # Aggregation lives in the server_activity_stats materialized
+            # view (see schema.sql); this only filters, orders, and rounds
+            # it into the response shape
+            execute_cached(cur, f"""
                 SELECT
-                    *,
-                    -- Training ratio: peak window vs baseline (relative, works for any squad size)
-                    peak_window_avg / NULLIF(GREATEST(baseline, 0.5), 0) as training_ratio
-                FROM server_summary
-                WHERE 1=1
-                  AND (%s = false OR password_required = true)
-                  AND (%s IS NULL OR peak_day = %s)
-                  AND (%s IS NULL OR %s IS NULL OR peak_hour BETWEEN %s AND %s)
-                  AND (%s IS NULL OR active_hours <= %s)
-                  AND (%s = false OR (baseline <= 1 AND peak_window_avg / NULLIF(GREATEST(baseline, 0.5), 0) >= 3))
-                  AND (%s IS NULL OR baseline <= %s)
-                  AND (%s IS NULL OR peak_window_avg / NULLIF(GREATEST(baseline, 0.5), 0) >= %s)
-                ORDER BY
-                    CASE WHEN %s THEN peak_window_avg / NULLIF(GREATEST(baseline, 0.5), 0) ELSE 0 END DESC,
-                    activity_score DESC NULLS LAST,
-                    peak_avg_players DESC
-                LIMIT %s
-            """, (
-                min_samples,
-                password_only,
-                peak_day, peak_day,
-                peak_hour_start, peak_hour_end, peak_hour_start, peak_hour_end,
-                max_active_hours, max_active_hours,
-                training_mode,
-                max_baseline, max_baseline,
-                min_training_ratio, min_training_ratio,
-                training_mode,
-                limit
-            ))
+                    server_id::text,
+                    server_name,
+                    COALESCE(password_required, false) as password_required,
+                    terrain,
+                    framework,
+                    peak_day,
+                    peak_hour,
+                    ROUND(peak_avg_players::numeric, 1)::float8 as peak_avg_players,
+                    total_samples::int,
+                    active_hours,
+                    ROUND(COALESCE(activity_score, 0)::numeric, 2)::float8 as activity_score,
+                    -- Baseline (25th percentile) and training ratio
+                    ROUND(COALESCE(baseline, 0)::numeric, 1)::float8 as off_peak_avg,
+                    ROUND(COALESCE(training_ratio, 0)::numeric, 1)::float8 as training_score
+                FROM server_activity_stats sas
+                WHERE {" AND ".join(f"({c})" for c in conditions)}
+                ORDER BY {order_by}
+                LIMIT {arg(limit)}
+            """, tuple(params))
             rows = cur.fetchall()
 
-    # Convert DOW from PostgreSQL (0=Sun) to ISO (0=Mon)
-    def convert_dow(pg_dow):
-        # PostgreSQL: 0=Sunday, 1=Monday, ..., 6=Saturday
-        # We want: 0=Monday, ..., 6=Sunday
-        return (pg_dow - 1) % 7 if pg_dow > 0 else 6
-
-    return [
-        ServerActivitySummary(
-            server_id=str(row["server_id"]),
-            server_name=row["server_name"],
-            password_required=row["password_required"] or False,
-            terrain=row["terrain"],
-            framework=row["framework"],
-            peak_day=convert_dow(row["peak_day"]),
-            peak_hour=row["peak_hour"],
-            peak_avg_players=round(float(row["peak_avg_players"]), 1),
-            total_samples=row["total_samples"],
-            active_hours=row["active_hours"],
-            activity_score=round(float(row["activity_score"] or 0), 2),
-            off_peak_avg=round(float(row["baseline"] or 0), 1),  # Now using baseline (25th percentile)
-            training_score=round(float(row["training_ratio"] or 0), 1),  # Now using training_ratio
-        )
-        for row in rows
-    ]
+    return ORJSONResponse(checked(ACTIVITY_LIST_ADAPTER, rows))
 
 
 @app.get("/api/servers/{server_id}/activity-heatmap", tags=["Analytics"])
@@ -749,36 +1315,22 @@ def get_server_activity_heatmap(server_id: str):
     """
     with get_db() as conn:
         with conn.cursor() as cur:
-            cur.execute("""
+            execute_prepared(cur, "activity_heatmap", """
                 SELECT
-                    EXTRACT(DOW FROM captured_at AT TIME ZONE 'America/New_York')::int as dow,
-                    EXTRACT(HOUR FROM captured_at AT TIME ZONE 'America/New_York')::int as hour_et,
-                    AVG(players_current) as avg_players,
+                    -- Generated ET columns; dow_et is 0=Monday ... 6=Sunday
+                    dow_et::int as day,
+                    hour_et::int as hour,
+                    ROUND(AVG(players_current), 1)::float8 as avg_players,
                     MAX(players_current) as max_players,
                     COUNT(*) as samples
                 FROM server_snapshots
-                WHERE server_id = %s::uuid
-                GROUP BY
-                    EXTRACT(DOW FROM captured_at AT TIME ZONE 'America/New_York'),
-                    EXTRACT(HOUR FROM captured_at AT TIME ZONE 'America/New_York')
-                ORDER BY dow, hour_et
+                WHERE server_id = $1::uuid
+                GROUP BY dow_et, hour_et
+                ORDER BY dow_et, hour_et
             """, (server_id,))
             rows = cur.fetchall()
 
-    # Convert to ISO day of week (0=Mon)
-    def convert_dow(pg_dow):
-        return (pg_dow - 1) % 7 if pg_dow > 0 else 6
-
-    return [
-        {
-            "day": convert_dow(row["dow"]),
-            "hour": row["hour_et"],
-            "avg_players": round(float(row["avg_players"]), 1),
-            "max_players": row["max_players"],
-            "samples": row["samples"],
-        }
-        for row in rows
-    ]
+    return ORJSONResponse(rows)
 
 
 @app.get("/api/health", tags=["System"])
@@ -795,4 +1347,4 @@ def health_check():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
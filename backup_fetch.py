@@ -12,7 +12,7 @@ Usage:
     python backup_fetch.py --stats             # Show backup statistics
 
 Requirements:
-    pip install playwright
+    pip install playwright orjson
     playwright install chromium
 
 Environment variables (or .env file):
@@ -21,12 +21,18 @@ Environment variables (or .env file):
 """
 
 import argparse
+import contextlib
+import functools
 import json
 import os
 import gzip
+import hashlib
+import io
+import operator
 import uuid
 import re
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -37,29 +43,69 @@ BACKUP_DIR = Path(__file__).parent / "backups"
 # Namespace UUID for generating deterministic server IDs
 SERVER_UUID_NAMESPACE = uuid.UUID('a1b2c3d4-e5f6-7890-abcd-ef1234567890')
 
+# Saved browser cookies/storage, so later fetches can skip the login
+BROWSER_STATE_FILE = Path(__file__).parent / ".browser_state.json"
+
+# --loop keeps one browser running between fetches; restart it daily
+BROWSER_RECYCLE_SECONDS = 24 * 60 * 60
+
 # DCS server list URL
 URL = "https://www.digitalcombatsimulator.com/en/personal/server/#allservers"
 
 
+@functools.lru_cache(maxsize=16384)
 def generate_server_id(ip: str, port: int) -> str:
-    """Generate a deterministic UUID for a server based on IP:port."""
+    """Generate a deterministic UUID for a server based on IP:port.
+
+    Cached: the same ip:port pairs recur in every backup being restored.
+    """
     key = f"{ip}:{port}"
     return str(uuid.uuid5(SERVER_UUID_NAMESPACE, key))
 
 
+def generate_server_ids(pairs: List[Tuple[str, int]]) -> List[str]:
+    """Generate server IDs for many (ip, port) pairs at once.
+
+    Same result as generate_server_id (uuid5 is SHA-1 over namespace + name),
+    hashed in one loop without the per-call uuid5 overhead.
+    """
+    ns = SERVER_UUID_NAMESPACE.bytes
+    sha1 = hashlib.sha1
+    return [
+        str(uuid.UUID(bytes=sha1(ns + f"{ip}:{port}".encode()).digest()[:16], version=5))
+        for ip, port in pairs
+    ]
+
+
 # ============================================================================
 # Text cleaning and parsing utilities
 # ============================================================================
 
+# Compiled once; these run on every row of every fetch
+_PLAYERS_RE = re.compile(r"(\d+)\s*/\s*(\d+)")
+_NUMS_RE = re.compile(r"\d+")
+_DAYS_RE = re.compile(r"(\d+)\s*d", re.IGNORECASE)
+# The control/format characters scraped text actually contains (all in
+# Unicode category C); anything rarer falls back to the category check
+_CTRL_RE = re.compile("[\x00-\x1f\x7f-\x9f\u200b-\u200f\ufeff]")
+
+
 def _clean(text: str) -> str:
     if text is None:
         return ""
     text = text.replace("\u00a0", " ")
-    text = "".join(ch for ch in text if unicodedata.category(ch)[0] != "C")
+    # isprintable() is False for every category C character, so most
+    # strings skip the per-character scan entirely
+    if not text.isprintable():
+        text = _CTRL_RE.sub("", text)
+        if not text.isprintable():
+            text = "".join(ch for ch in text if unicodedata.category(ch)[0] != "C")
     return " ".join(text.split()).strip()
 
 
+@functools.lru_cache(maxsize=None)
 def _load_env(path: str = ".env") -> Tuple[bool, List[str]]:
+    # Cached: --loop fetches repeatedly, and .env is read once per process
     if not os.path.exists(path):
         return False, []
     try:
@@ -84,10 +130,10 @@ def _parse_players(value: str) -> Tuple[Optional[int], Optional[int]]:
     if not value:
         return None, None
     value = _clean(value)
-    match = re.search(r"(\d+)\s*/\s*(\d+)", value)
+    match = _PLAYERS_RE.search(value)
     if match:
         return int(match.group(1)), int(match.group(2))
-    nums = re.findall(r"\d+", value)
+    nums = _NUMS_RE.findall(value)
     if len(nums) == 1:
         return int(nums[0]), None
     if len(nums) >= 2:
@@ -100,72 +146,137 @@ def _parse_hms(value: str) -> Optional[int]:
         return None
     cleaned = _clean(value)
     days = 0
-    match = re.search(r"(\d+)\s*d", cleaned, re.IGNORECASE)
-    if match:
-        days = int(match.group(1))
-        cleaned = cleaned.replace(match.group(0), "").strip()
+    # Most values are plain H:M:S; only look for a day count when one can exist
+    if "d" in cleaned or "D" in cleaned:
+        match = _DAYS_RE.search(cleaned)
+        if match:
+            days = int(match.group(1))
+            cleaned = cleaned.replace(match.group(0), "").strip()
     if not cleaned:
         return days * 86400 if days else None
     parts = cleaned.split(":")
-    if not all(p.isdigit() for p in parts):
+    if len(parts) > 3 or not all(p.isdigit() for p in parts):
         return None
-    nums = [int(p) for p in parts]
-    if len(nums) == 3:
-        return days * 86400 + nums[0] * 3600 + nums[1] * 60 + nums[2]
-    if len(nums) == 2:
-        return days * 86400 + nums[0] * 60 + nums[1]
-    if len(nums) == 1:
-        return days * 86400 + nums[0]
-    return None
+    # [[H:]M:]S, accumulated base-60
+    seconds = 0
+    for part in parts:
+        seconds = seconds * 60 + int(part)
+    return days * 86400 + seconds
 
 
 def _row_has_data(row: Dict[str, Any]) -> bool:
-    return any(_clean(str(v)) for v in row.values() if v is not None)
+    # Printable text has nothing for _clean to strip but whitespace
+    return any(
+        text.strip() if text.isprintable() else _clean(text)
+        for text in (str(v) for v in row.values() if v is not None)
+    )
 
 
 def _normalized_has_core_fields(row: Dict[str, Any]) -> bool:
     return bool(row.get("server_name") or row.get("ip_address") or row.get("port"))
 
 
+# Header aliases per output field, in priority order, and the positional
+# column used when none of them yields a value
+_FIELD_ALIASES: Dict[str, Tuple[Tuple[str, ...], str]] = {
+    "server_name": (("server name", "server_name", "servername", "name"), "col1"),
+    "ip_address": (("ip address", "ip", "address", "host", "server ip"), "col4"),
+    "port": (("port", "server port"), "col5"),
+    "players": (("players", "slots"), "col6"),
+    "password": (("pass.", "pass", "password", "password required", "locked"), "col7"),
+    "mission": (("mission", "current mission", "scenario"), "col8"),
+    "mission_time": (("mission time", "time", "uptime"), "col9"),
+    "description": (("description", "desc"), "col2"),
+    "dcs_version": (("dcs version", "version"), "col3"),
+}
+
+# Inverted: lowercased header -> (field, priority); fallback columns rank last
+_ALIAS_INDEX: Dict[str, Tuple[str, int]] = {}
+for _field, (_aliases, _fallback) in _FIELD_ALIASES.items():
+    for _rank, _alias in enumerate(_aliases):
+        _ALIAS_INDEX[_alias] = (_field, _rank)
+    _ALIAS_INDEX[_fallback] = (_field, len(_aliases))
+
+
+@functools.lru_cache(maxsize=256)
+def _header_alias(header: str) -> Optional[Tuple[str, int]]:
+    """(field, priority) for a raw table header, or None if it is not an alias.
+
+    Cached: every row of a fetch repeats the same handful of headers.
+    """
+    return _ALIAS_INDEX.get(_clean(header).lower())
+
+
+# Plan entry for a field with no matching header; row.get() of it is None
+_NO_KEY = object()
+
+
+@functools.lru_cache(maxsize=64)
+def _row_plan(keys: Tuple[Any, ...]) -> Dict[str, Tuple[Any, Any]]:
+    """Per output field, the row key to read and the colN key to fall back to.
+
+    Which header wins depends only on the headers, and every row of a table
+    has the same ones, so this is worked out once per table, not per row:
+    the best-ranked alias present and, among duplicate headers, the last one.
+    """
+    found: Dict[str, Tuple[int, Any]] = {}
+    fallback: Dict[str, Any] = {}
+    for k in keys:
+        hit = _header_alias(str(k))
+        if hit is None:
+            continue
+        field, rank = hit
+        if rank == len(_FIELD_ALIASES[field][0]):
+            fallback[field] = k
+        elif field not in found or rank <= found[field][0]:
+            found[field] = (rank, k)
+    return {
+        field: (found[field][1] if field in found else _NO_KEY, fallback.get(field, _NO_KEY))
+        for field in _FIELD_ALIASES
+    }
+
+
+def _pick(row: Dict[str, Any], plan: Dict[str, Tuple[Any, Any]], field: str) -> str:
+    key, fallback_key = plan[field]
+    val = row.get(key)
+    text = _clean(str(val)) if val is not None else ""
+    if not text:
+        val = row.get(fallback_key)
+        if val is not None:
+            text = _clean(str(val))
+    return text
+
+
+def _raw_has_core_fields(row: Dict[str, Any]) -> bool:
+    """Same answer as _normalized_has_core_fields(_normalize_row(row)), cheaper.
+
+    Only the name, address and port are looked at, so rows that would be
+    dropped anyway are not fully normalized first.
+    """
+    plan = _row_plan(tuple(row))
+    if _pick(row, plan, "server_name") or _pick(row, plan, "ip_address"):
+        return True
+    try:
+        return bool(int(_pick(row, plan, "port") or 0))
+    except ValueError:
+        return False
+
+
 def _normalize_row(row: Dict[str, Any]) -> Dict[str, Any]:
-    lower = {_clean(str(k)).lower(): v for k, v in row.items()}
-
-    def pick(*names: str) -> str:
-        for name in names:
-            key = name.strip().lower()
-            if key in lower:
-                val = lower[key]
-                return _clean(str(val)) if val is not None else ""
-        return ""
+    plan = _row_plan(tuple(row))
+
+    def pick(field: str) -> str:
+        return _pick(row, plan, field)
 
-    server_name = pick("server name", "server_name", "servername", "name")
-    ip_address = pick("ip address", "ip", "address", "host", "server ip")
-    port_raw = pick("port", "server port")
-    players_raw = pick("players", "slots")
-    pass_raw = pick("pass.", "pass", "password", "password required", "locked")
-    mission = pick("mission", "current mission", "scenario")
-    mission_time = pick("mission time", "time", "uptime")
-    description = pick("description", "desc")
-    dcs_version = pick("dcs version", "version")
-
-    if not server_name:
-        server_name = pick("col1")
-    if not description:
-        description = pick("col2")
-    if not dcs_version:
-        dcs_version = pick("col3")
-    if not ip_address:
-        ip_address = pick("col4")
-    if not port_raw:
-        port_raw = pick("col5")
-    if not players_raw:
-        players_raw = pick("col6")
-    if not pass_raw:
-        pass_raw = pick("col7")
-    if not mission:
-        mission = pick("col8")
-    if not mission_time:
-        mission_time = pick("col9")
+    server_name = pick("server_name")
+    ip_address = pick("ip_address")
+    port_raw = pick("port")
+    players_raw = pick("players")
+    pass_raw = pick("password")
+    mission = pick("mission")
+    mission_time = pick("mission_time")
+    description = pick("description")
+    dcs_version = pick("dcs_version")
 
     try:
         port = int(port_raw) if port_raw else None
@@ -202,27 +313,7 @@ def _normalize_row(row: Dict[str, Any]) -> Dict[str, Any]:
 # ============================================================================
 
 def _login_form_is_visible(page) -> bool:
-    return bool(
-        page.evaluate(
-            """
-            () => {
-                const forms = Array.from(
-                    document.querySelectorAll('form.bx_auth_form, form[name="system_auth_form"], form[action*="/personal/server/"]')
-                );
-                for (const form of forms) {
-                    const user = form.querySelector('#USER_LOGIN, input[name="USER_LOGIN"]');
-                    const passw = form.querySelector('#USER_PASSWORD, input[name="USER_PASSWORD"]');
-                    if (!user || !passw) continue;
-                    const style = window.getComputedStyle(form);
-                    const visible = style && style.display !== 'none' && style.visibility !== 'hidden' && style.opacity !== '0';
-                    const userVisible = user.offsetParent !== null;
-                    if (visible && userVisible) return true;
-                }
-                return false;
-            }
-            """
-        )
-    )
+    return bool(page.evaluate("() => __dcs.loginVisible()"))
 
 
 def _submit_login_form(page, user: str, password: str) -> bool:
@@ -267,164 +358,255 @@ def _submit_login_form(page, user: str, password: str) -> bool:
     return True
 
 
-def _wait_for_rows(page, timeout_ms: int) -> None:
-    page.wait_for_function(
-        """
-        () => {
-            const root = document.querySelector('#allservers') || document.body;
-            const table = root.querySelector('#servers') || root.querySelector('table') || document.querySelector('#servers') || document.querySelector('table');
-            if (!table) return false;
-                const rows = Array.from(table.querySelectorAll('tbody tr'));
-                if (!rows.length) return false;
-                return rows.some(r => {
-                    const cell = r.querySelector('td');
-                    if (!cell) return false;
-                    let text = (cell.innerText || cell.textContent || '').trim();
-                    text = text.replace(/[\\x00-\\x1f\\x7f\\u200b-\\u200f\\ufeff]/g, '').trim();
-                    return text.length > 0;
+# Page scripts, each a standalone function. They are installed once per
+# document as window.__dcs (see _DCS_HELPERS_JS), so each evaluate only
+# sends a short call instead of the script source.
+_LOGIN_VISIBLE_JS = """
+    () => {
+        const forms = Array.from(
+            document.querySelectorAll('form.bx_auth_form, form[name="system_auth_form"], form[action*="/personal/server/"]')
+        );
+        for (const form of forms) {
+            const user = form.querySelector('#USER_LOGIN, input[name="USER_LOGIN"]');
+            const passw = form.querySelector('#USER_PASSWORD, input[name="USER_PASSWORD"]');
+            if (!user || !passw) continue;
+            const style = window.getComputedStyle(form);
+            const visible = style && style.display !== 'none' && style.visibility !== 'hidden' && style.opacity !== '0';
+            const userVisible = user.offsetParent !== null;
+            if (visible && userVisible) return true;
+        }
+        return false;
+    }
+"""
+
+_ROWS_READY_JS = """
+    () => {
+        const root = document.querySelector('#allservers') || document.body;
+        const table = root.querySelector('#servers') || root.querySelector('table') || document.querySelector('#servers') || document.querySelector('table');
+        if (!table) return false;
+        const rows = Array.from(table.querySelectorAll('tbody tr'));
+        if (!rows.length) return false;
+        return rows.some(r => {
+            const cell = r.querySelector('td');
+            if (!cell) return false;
+            let text = (cell.innerText || cell.textContent || '').trim();
+            text = text.replace(/[\\x00-\\x1f\\x7f\\u200b-\\u200f\\ufeff]/g, '').trim();
+            return text.length > 0;
+        });
+    }
+"""
+
+_PAGE_SIGNATURE_JS = """
+    () => {
+        const info = document.querySelector('#servers_info');
+        const infoText = info ? info.innerText.trim() : '';
+        const root = document.querySelector('#allservers') || document.body;
+        const table = root.querySelector('#servers') || root.querySelector('table');
+        const cell = table ? table.querySelector('tbody tr td') : null;
+        let cellText = cell ? (cell.innerText || cell.textContent || '') : '';
+        cellText = cellText.replace(/[\\x00-\\x1f\\x7f\\u200b-\\u200f\\ufeff]/g, '').trim();
+        return `${infoText}|${cellText}`;
+    }
+"""
+
+_HAS_NEXT_PAGE_JS = """
+    () => {
+        const li = document.querySelector('#servers_next');
+        if (!li) return false;
+        return !li.classList.contains('disabled');
+    }
+"""
+
+_GO_NEXT_PAGE_JS = """
+    () => {
+        if (window.jQuery && window.jQuery.fn && window.jQuery.fn.dataTable) {
+            const table = window.jQuery('#servers').DataTable();
+            table.page('next').draw('page');
+            return true;
+        }
+        const a = document.querySelector('#servers_next a');
+        if (!a) return false;
+        a.click();
+        return true;
+    }
+"""
+
+_TABLE_DATA_JS = """
+    () => {
+        const root = document.querySelector('#allservers') || document.body;
+        const table = root.querySelector('#servers') || root.querySelector('table') || document.querySelector('#servers') || document.querySelector('table');
+        if (!table) return null;
+
+        const headers = Array.from(table.querySelectorAll('thead th, thead td')).map(th =>
+            (th.innerText || th.textContent || '').trim()
+        );
+        const clean = (value) => {
+            if (!value) return '';
+            return String(value)
+                .replace(/[\\x00-\\x1f\\x7f\\u200b-\\u200f\\ufeff]/g, '')
+                .replace(/\\u00a0/g, ' ')
+                .trim();
+        };
+        const cellText = (td) => {
+            const text = (td.innerText || '').trim()
+                || (td.textContent || '').trim()
+                || (td.getAttribute('data-value') || '').trim()
+                || (td.getAttribute('title') || '').trim();
+            return clean(text);
+        };
+
+        const rows = [];
+        const trs = Array.from(table.querySelectorAll('tbody tr'));
+        for (const tr of trs) {
+            if (tr.classList.contains('child')) {
+                const prev = rows[rows.length - 1];
+                if (!prev) continue;
+                const items = tr.querySelectorAll('li');
+                items.forEach(li => {
+                    const title = clean(li.querySelector('.dtr-title')?.innerText || '');
+                    const data = clean(li.querySelector('.dtr-data')?.innerText || '');
+                    if (!title) return;
+                    if (!prev[title] || !String(prev[title]).trim()) {
+                        prev[title] = data;
+                    }
                 });
+                continue;
             }
-            """,
-        timeout=timeout_ms,
-    )
-
 
-def _page_signature(page) -> str:
-    return page.evaluate(
-        """
-        () => {
-            const info = document.querySelector('#servers_info');
-            const infoText = info ? info.innerText.trim() : '';
-            const root = document.querySelector('#allservers') || document.body;
-            const table = root.querySelector('#servers') || root.querySelector('table');
-            const cell = table ? table.querySelector('tbody tr td') : null;
-            let cellText = cell ? (cell.innerText || cell.textContent || '') : '';
-            cellText = cellText.replace(/[\\x00-\\x1f\\x7f\\u200b-\\u200f\\ufeff]/g, '').trim();
-            return `${infoText}|${cellText}`;
+            const cells = Array.from(tr.querySelectorAll('td'));
+            if (!cells.length) continue;
+            const obj = {};
+            cells.forEach((td, idx) => {
+                const key = headers[idx] || `col${idx + 1}`;
+                obj[key] = cellText(td);
+            });
+            rows.push(obj);
         }
-        """
-    )
 
+        if (!rows.length) return null;
+        return rows;
+    }
+"""
 
-def _set_page_length(page) -> Optional[int]:
-    value = page.evaluate(
-        """
-        () => {
-            const sel = document.querySelector('#servers_length select, select[name="servers_length"]');
-            if (!sel) return null;
-            const vals = Array.from(sel.options)
-                .map(o => parseInt(o.value, 10))
-                .filter(v => Number.isFinite(v));
-            if (!vals.length) return null;
-            const max = Math.max(...vals);
-            if (sel.value !== String(max)) {
-                sel.value = String(max);
-                sel.dispatchEvent(new Event('change', { bubbles: true }));
-            }
-            return max;
+_SET_PAGE_LENGTH_JS = """
+    () => {
+        const sel = document.querySelector('#servers_length select, select[name="servers_length"]');
+        if (!sel) return null;
+        const vals = Array.from(sel.options)
+            .map(o => parseInt(o.value, 10))
+            .filter(v => Number.isFinite(v));
+        if (!vals.length) return null;
+        // DataTables' "All" option (-1) puts every row on one page
+        const len = vals.includes(-1) ? -1 : Math.max(...vals);
+        if (sel.value !== String(len)) {
+            sel.value = String(len);
+            sel.dispatchEvent(new Event('change', { bubbles: true }));
         }
-        """
-    )
-    return value
+        return len;
+    }
+"""
 
+# Registered with page.add_init_script, so it is defined on every document
+# the page loads, including after the login redirect. scrape() reads the
+# page's rows and signature, then moves to the next page if there is one;
+# the signature is taken before advancing, for the caller to wait on.
+_DCS_HELPERS_JS = (
+    "window.__dcs = {"
+    "loginVisible: " + _LOGIN_VISIBLE_JS + ","
+    "rowsReady: " + _ROWS_READY_JS + ","
+    "signature: " + _PAGE_SIGNATURE_JS + ","
+    "hasNext: " + _HAS_NEXT_PAGE_JS + ","
+    "goNext: " + _GO_NEXT_PAGE_JS + ","
+    "extract: " + _TABLE_DATA_JS + ","
+    "setPageLength: " + _SET_PAGE_LENGTH_JS + ","
+    "scrape() {"
+    "const rows = this.extract();"
+    "const signature = this.signature();"
+    "const advanced = this.hasNext() && this.goNext();"
+    "return { rows, signature, advanced };"
+    "},"
+    # Resolves true once the signature differs from prev, re-checking only
+    # when the table's DOM changes, or false after timeoutMs
+    "waitForChange(prev, timeoutMs) {"
+    "return new Promise(resolve => {"
+    "if (this.signature() !== prev) return resolve(true);"
+    "const root = document.querySelector('#allservers') || document.body;"
+    "let timer = null;"
+    "const observer = new MutationObserver(() => {"
+    "if (this.signature() === prev) return;"
+    "clearTimeout(timer); observer.disconnect(); resolve(true);"
+    "});"
+    "observer.observe(root, { childList: true, subtree: true, characterData: true });"
+    "timer = setTimeout(() => { observer.disconnect(); resolve(false); }, timeoutMs);"
+    "});"
+    "},"
+    "};"
+)
+
+# Polled fallback for _wait_for_signature_change
+_SIGNATURE_CHANGED_JS = "(prev) => __dcs.signature() !== prev"
 
-def _has_next_page(page) -> bool:
-    return bool(
-        page.evaluate(
-            """
-            () => {
-                const li = document.querySelector('#servers_next');
-                if (!li) return false;
-                return !li.classList.contains('disabled');
-            }
-            """
-        )
-    )
 
+def _wait_for_rows(page, timeout_ms: int) -> None:
+    page.wait_for_function("() => __dcs.rowsReady()", timeout=timeout_ms)
 
-def _go_next_page(page) -> bool:
-    return bool(
-        page.evaluate(
-            """
-            () => {
-                if (window.jQuery && window.jQuery.fn && window.jQuery.fn.dataTable) {
-                    const table = window.jQuery('#servers').DataTable();
-                    table.page('next').draw('page');
-                    return true;
-                }
-                const a = document.querySelector('#servers_next a');
-                if (!a) return false;
-                a.click();
-                return true;
-            }
-            """
-        )
-    )
 
+def _page_signature(page) -> str:
+    return page.evaluate("() => __dcs.signature()")
 
-def _extract_table_data(page) -> Optional[List[Dict[str, str]]]:
-    """Extract server data from the visible table."""
-    return page.evaluate(
-        """
-        () => {
-            const root = document.querySelector('#allservers') || document.body;
-            const table = root.querySelector('#servers') || root.querySelector('table') || document.querySelector('#servers') || document.querySelector('table');
-            if (!table) return null;
 
-            const headers = Array.from(table.querySelectorAll('thead th, thead td')).map(th =>
-                (th.innerText || th.textContent || '').trim()
-            );
-            const clean = (value) => {
-                if (!value) return '';
-                return String(value)
-                    .replace(/[\\x00-\\x1f\\x7f\\u200b-\\u200f\\ufeff]/g, '')
-                    .replace(/\\u00a0/g, ' ')
-                    .trim();
-            };
-            const cellText = (td) => {
-                const text = (td.innerText || '').trim()
-                    || (td.textContent || '').trim()
-                    || (td.getAttribute('data-value') || '').trim()
-                    || (td.getAttribute('title') || '').trim();
-                return clean(text);
-            };
-
-            const rows = [];
-            const trs = Array.from(table.querySelectorAll('tbody tr'));
-            for (const tr of trs) {
-                if (tr.classList.contains('child')) {
-                    const prev = rows[rows.length - 1];
-                    if (!prev) continue;
-                    const items = tr.querySelectorAll('li');
-                    items.forEach(li => {
-                        const title = clean(li.querySelector('.dtr-title')?.innerText || '');
-                        const data = clean(li.querySelector('.dtr-data')?.innerText || '');
-                        if (!title) return;
-                        if (!prev[title] || !String(prev[title]).trim()) {
-                            prev[title] = data;
-                        }
-                    });
-                    continue;
-                }
-
-                const cells = Array.from(tr.querySelectorAll('td'));
-                if (!cells.length) continue;
-                const obj = {};
-                cells.forEach((td, idx) => {
-                    const key = headers[idx] || `col${idx + 1}`;
-                    obj[key] = cellText(td);
-                });
-                rows.push(obj);
-            }
+def _wait_for_signature_change(page, prev: str, timeout_ms: int) -> bool:
+    """Wait for the table to redraw away from signature prev.
 
-            if (!rows.length) return null;
-            return rows;
-        }
-        """
-    )
+    Woken by a MutationObserver in the page rather than polling. Falls back
+    to wait_for_function if the evaluate is interrupted (e.g. the click
+    fallback navigated). Returns False on timeout.
+    """
+    from playwright.sync_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+    try:
+        return bool(page.evaluate(
+            "([prev, ms]) => __dcs.waitForChange(prev, ms)", [prev, timeout_ms]
+        ))
+    except PlaywrightError:
+        try:
+            page.wait_for_function(_SIGNATURE_CHANGED_JS, arg=prev, timeout=timeout_ms)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+
+
+def _set_page_length(page) -> Optional[int]:
+    return page.evaluate("() => __dcs.setPageLength()")
+
+
+def _scrape_page(page) -> Dict[str, Any]:
+    """Extract the visible table and advance to the next page in one call.
+
+    Returns {"rows", "signature", "advanced"}; signature is the page's
+    signature before advancing.
+    """
+    return page.evaluate("() => __dcs.scrape()")
+
+
+def _row_key(row: Dict[str, Any]) -> Tuple:
+    """Hashable dedup key for a scraped row, equal for rows with equal content.
 
+    Table rows are all strings; any other value (from JSON responses) is
+    keyed by its repr, tagged so it can never collide with a string.
+    """
+    return tuple(sorted(
+        (k, v) if type(v) is str else (k, None, repr(v))
+        for k, v in row.items()
+    ))
 
-def _extract_all_pages(page, timeout_ms: int) -> Optional[List[Dict[str, str]]]:
+
+def _extract_all_pages(page, timeout_ms: int) -> Tuple[Optional[List[Dict[str, str]]], set]:
+    """Read every page of the server table.
+
+    Returns (rows or None, the set of _row_key values of those rows), so
+    callers can merge more rows without re-keying these.
+    """
     from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
     all_rows: List[Dict[str, str]] = []
@@ -433,70 +615,31 @@ def _extract_all_pages(page, timeout_ms: int) -> Optional[List[Dict[str, str]]]:
     try:
         _wait_for_rows(page, timeout_ms)
     except PlaywrightTimeoutError:
-        return None
+        return None, seen
 
     signature = _page_signature(page)
     if _set_page_length(page):
-        try:
-            page.wait_for_function(
-                "(prev) => {"
-                "const info = document.querySelector('#servers_info');"
-                "const infoText = info ? info.innerText.trim() : '';"
-                "const root = document.querySelector('#allservers') || document.body;"
-                "const table = root.querySelector('#servers') || root.querySelector('table');"
-                "const cell = table ? table.querySelector('tbody tr td') : null;"
-                "let cellText = cell ? (cell.innerText || cell.textContent || '') : '';"
-                "cellText = cellText.replace(/[\\x00-\\x1f\\x7f\\u200b-\\u200f\\ufeff]/g, '').trim();"
-                "const sig = `${infoText}|${cellText}`;"
-                "return sig !== prev;"
-                "}",
-                arg=signature,
-                timeout=timeout_ms,
-            )
-        except PlaywrightTimeoutError:
-            pass
-        signature = _page_signature(page)
+        _wait_for_signature_change(page, signature, timeout_ms)
 
     while True:
-        rows = _extract_table_data(page) or []
-        rows = [row for row in rows if _row_has_data(row)]
+        state = _scrape_page(page)
+        rows = [row for row in state["rows"] or [] if _row_has_data(row)]
         for row in rows:
-            key = json.dumps(row, sort_keys=True, ensure_ascii=True)
+            key = _row_key(row)
             if key not in seen:
                 seen.add(key)
                 all_rows.append(row)
 
-        if not _has_next_page(page):
+        if not state["advanced"]:
             break
 
-        before = signature
-        if not _go_next_page(page):
-            break
-        try:
-            page.wait_for_load_state("networkidle", timeout=timeout_ms)
-        except PlaywrightTimeoutError:
-            pass
-        try:
-            page.wait_for_function(
-                "(prev) => {"
-                "const info = document.querySelector('#servers_info');"
-                "const infoText = info ? info.innerText.trim() : '';"
-                "const root = document.querySelector('#allservers') || document.body;"
-                "const table = root.querySelector('#servers') || root.querySelector('table');"
-                "const cell = table ? table.querySelector('tbody tr td') : null;"
-                "let cellText = cell ? (cell.innerText || cell.textContent || '') : '';"
-                "cellText = cellText.replace(/[\\x00-\\x1f\\x7f\\u200b-\\u200f\\ufeff]/g, '').trim();"
-                "const sig = `${infoText}|${cellText}`;"
-                "return sig !== prev;"
-                "}",
-                arg=before,
-                timeout=timeout_ms,
-            )
-        except PlaywrightTimeoutError:
+        before = state["signature"]
+        # No networkidle wait: paging is client-side, and the signature
+        # check is the actual completion signal
+        if not _wait_for_signature_change(page, before, timeout_ms):
             break
-        signature = _page_signature(page)
 
-    return all_rows or None
+    return all_rows or None, seen
 
 
 def _extract_json_rows(candidate: Any) -> Optional[List[Dict[str, Any]]]:
@@ -522,13 +665,57 @@ def _maybe_pick_json(candidate: Any, best: Tuple[int, Optional[Any]]) -> Tuple[i
     return best
 
 
+def _parse_json_bodies(bodies: List[bytes]) -> Tuple[Optional[Any], List[Dict[str, Any]], List[Tuple]]:
+    """Parse captured JSON responses: (best candidate, deduplicated rows, their keys)."""
+    import orjson
+
+    best: Tuple[int, Optional[Any]] = (-1, None)
+    rows_out: List[Dict[str, Any]] = []
+    keys: List[Tuple] = []
+    seen = set()
+    for body in bodies:
+        try:
+            data = orjson.loads(body)
+            best = _maybe_pick_json(data, best)
+            for row in _extract_json_rows(data) or ():
+                key = _row_key(row)
+                if key in seen:
+                    continue
+                seen.add(key)
+                rows_out.append(row)
+                keys.append(key)
+        except Exception:
+            continue
+    return best[1], rows_out, keys
+
+
 # ============================================================================
 # Main fetch function
 # ============================================================================
 
-def fetch_servers_data() -> List[Dict[str, Any]]:
-    """Fetch server data from DCS website using Playwright."""
-    from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+# Never needed to read the server table. Stylesheets are still loaded: the
+# login-form visibility checks rely on computed styles.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+
+def _block_unneeded_resources(route) -> None:
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+def _launch_browser(p):
+    return p.chromium.launch(headless=True, args=["--blink-settings=imagesEnabled=false"])
+
+
+def fetch_servers_data(browser=None) -> List[Dict[str, Any]]:
+    """Fetch server data from DCS website using Playwright.
+
+    Pass a running browser to reuse it (run_loop does); otherwise one is
+    launched for this fetch and closed afterwards.
+    """
+    from playwright.sync_api import sync_playwright
 
     # Load credentials
     _load_env()
@@ -540,34 +727,49 @@ def fetch_servers_data() -> List[Dict[str, Any]]:
 
     print(f"[{datetime.now()}] Fetching server data...")
 
-    timeout_ms = 30000
-    best_json: Tuple[int, Optional[Any]] = (-1, None)
-    json_rows: List[Dict[str, Any]] = []
-    json_seen = set()
+    if browser is not None:
+        return _fetch_with_browser(browser, user, password)
 
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+        browser = _launch_browser(p)
+        try:
+            return _fetch_with_browser(browser, user, password)
+        finally:
+            browser.close()
 
-        def _add_json_rows(rows: List[Dict[str, Any]]) -> None:
-            for row in rows:
-                key = json.dumps(row, sort_keys=True, ensure_ascii=True)
-                if key in json_seen:
-                    continue
-                json_seen.add(key)
-                json_rows.append(row)
+
+def _fetch_with_browser(browser, user: str, password: str) -> List[Dict[str, Any]]:
+    """Scrape the server list in a fresh context of an already running browser."""
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+    timeout_ms = 30000
+    # Response bodies are only collected while the page is driven; parsing
+    # them waits until the table has been scraped
+    json_bodies: List[bytes] = []
+
+    # A context per fetch starts from the saved session without carrying
+    # over the previous fetch's page, listeners or cache
+    context = None
+    if BROWSER_STATE_FILE.exists():
+        try:
+            context = browser.new_context(storage_state=str(BROWSER_STATE_FILE))
+        except Exception as e:
+            # A corrupt state file would otherwise fail every later fetch
+            print(f"Discarding unreadable browser state: {e}")
+            BROWSER_STATE_FILE.unlink(missing_ok=True)
+    if context is None:
+        context = browser.new_context()
+    try:
+        page = context.new_page()
+        page.add_init_script(script=_DCS_HELPERS_JS)
+        page.route("**/*", _block_unneeded_resources)
 
         def on_response(resp):
-            nonlocal best_json
             try:
                 ct = resp.headers.get("content-type", "")
                 if "application/json" not in ct:
                     return
-                data = resp.json()
-                best_json = _maybe_pick_json(data, best_json)
-                rows = _extract_json_rows(data)
-                if rows:
-                    _add_json_rows(rows)
+                json_bodies.append(resp.body())
             except Exception:
                 return
 
@@ -579,12 +781,14 @@ def fetch_servers_data() -> List[Dict[str, Any]]:
         except PlaywrightTimeoutError:
             pass
 
-        submitted = _submit_login_form(page, user, password)
+        # A saved session usually lands straight on the server list
+        if not has_state or _login_form_is_visible(page):
+            _submit_login_form(page, user, password)
 
-        try:
-            page.wait_for_load_state("networkidle", timeout=timeout_ms)
-        except PlaywrightTimeoutError:
-            pass
+            try:
+                page.wait_for_load_state("networkidle", timeout=timeout_ms)
+            except PlaywrightTimeoutError:
+                pass
 
         if "personal/server" not in page.url:
             page.goto(URL, wait_until="domcontentloaded", timeout=timeout_ms)
@@ -594,41 +798,46 @@ def fetch_servers_data() -> List[Dict[str, Any]]:
         except PlaywrightTimeoutError:
             pass
 
-        data = _extract_all_pages(page, timeout_ms)
+        data, page_seen = _extract_all_pages(page, timeout_ms)
+        best_json, json_rows, json_keys = _parse_json_bodies(json_bodies)
 
         if data is None and json_rows:
             data = json_rows
 
         if data is None:
-            data = best_json[1]
+            data = best_json
         elif json_rows and len(json_rows) > len(data):
-            merged_seen = set()
-            merged: List[Dict[str, Any]] = []
-            for row in data + json_rows:
-                key = json.dumps(row, sort_keys=True, ensure_ascii=True)
-                if key in merged_seen:
-                    continue
-                merged_seen.add(key)
-                merged.append(row)
-            data = merged
+            # Both sides are already deduplicated, with their keys kept
+            data = data + [
+                row for row, key in zip(json_rows, json_keys) if key not in page_seen
+            ]
 
         if data is None:
+            # Don't reuse a session that may be what broke this fetch
+            BROWSER_STATE_FILE.unlink(missing_ok=True)
             if _login_form_is_visible(page):
-                browser.close()
                 raise Exception("Login failed - check credentials")
-            browser.close()
             raise Exception("Could not extract server data")
 
-        if isinstance(data, dict):
-            data_list: List[Dict[str, Any]] = [data]
-        else:
-            data_list = list(data)
+        # Holds session cookies: written owner-only to a temp file and
+        # swapped in, so a crash mid-write never leaves a partial file
+        state = context.storage_state()
+        tmp_path = BROWSER_STATE_FILE.with_suffix(".tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            os.fchmod(fd, 0o600)
+            json.dump(state, f)
+        os.replace(tmp_path, BROWSER_STATE_FILE)
+    finally:
+        context.close()
 
-        # Normalize rows
-        data_list = [_normalize_row(row) for row in data_list]
-        data_list = [row for row in data_list if _normalized_has_core_fields(row)]
+    if isinstance(data, dict):
+        data_list: List[Dict[str, Any]] = [data]
+    else:
+        data_list = list(data)
 
-        browser.close()
+    # Normalize rows
+    data_list = [_normalize_row(row) for row in data_list if _raw_has_core_fields(row)]
 
     return data_list
 
@@ -639,6 +848,8 @@ def fetch_servers_data() -> List[Dict[str, Any]]:
 
 def save_backup(servers: list, backup_dir: Path = BACKUP_DIR) -> Path:
     """Save server data to a timestamped backup file."""
+    import orjson
+
     now = datetime.now(timezone.utc)
 
     # Create directory structure: backups/YYYY/MM/DD/
@@ -649,39 +860,46 @@ def save_backup(servers: list, backup_dir: Path = BACKUP_DIR) -> Path:
     filename = now.strftime("%H-%M-%S") + ".json.gz"
     filepath = date_dir / filename
 
-    # Generate deterministic IDs and prepare snapshots
-    snapshots = []
-    for server in servers:
-        ip = server.get("ip_address", "")
-        port = server.get("port", 0)
-        server_id = generate_server_id(ip, port)
+    # Generate deterministic IDs
+    captured_at = now.isoformat()
+    server_ids = generate_server_ids(
+        [(server.get("ip_address", ""), server.get("port", 0)) for server in servers]
+    )
+    for server, server_id in zip(servers, server_ids):
         server["id"] = server_id
 
-        snapshot = {
-            "server_id": server_id,
-            "captured_at": now.isoformat(),
-            "players_current": server.get("players_current", 0),
-            "players_max": server.get("players_max"),
-            "mission": server.get("mission"),
-            "mission_time_secs": server.get("mission_time_seconds"),
-            "is_online": True,
-        }
-        snapshots.append(snapshot)
-
-    backup_data = {
-        "metadata": {
-            "captured_at": now.isoformat(),
-            "captured_at_unix": int(now.timestamp()),
-            "server_count": len(servers),
-            "total_players": sum(s.get("players_current", 0) or 0 for s in servers),
-            "version": "1.0",
-        },
-        "servers": servers,
-        "snapshots": snapshots,
+    metadata = {
+        "captured_at": captured_at,
+        "captured_at_unix": int(now.timestamp()),
+        "server_count": len(servers),
+        "total_players": sum(s.get("players_current", 0) or 0 for s in servers),
+        "version": "1.0",
     }
 
-    with gzip.open(filepath, 'wt', encoding='utf-8') as f:
-        json.dump(backup_data, f, indent=None, separators=(',', ':'))
+    # Written one row at a time, so neither the snapshot list nor the whole
+    # encoded document is held in memory. The bytes are the same as
+    # orjson.dumps({"metadata": ..., "servers": [...], "snapshots": [...]}).
+    # Backups are written every few minutes and read rarely: fastest gzip level
+    with gzip.GzipFile(filepath, 'wb', compresslevel=1) as f:
+        f.write(b'{"metadata":' + orjson.dumps(metadata) + b',"servers":[')
+        for i, server in enumerate(servers):
+            if i:
+                f.write(b",")
+            f.write(orjson.dumps(server))
+        f.write(b'],"snapshots":[')
+        for i, server in enumerate(servers):
+            if i:
+                f.write(b",")
+            f.write(orjson.dumps({
+                "server_id": server["id"],
+                "captured_at": captured_at,
+                "players_current": server.get("players_current", 0),
+                "players_max": server.get("players_max"),
+                "mission": server.get("mission"),
+                "mission_time_secs": server.get("mission_time_seconds"),
+                "is_online": True,
+            }))
+        f.write(b"]}")
 
     # Update latest.json.gz symlink
     latest_path = backup_dir / "latest.json.gz"
@@ -699,18 +917,20 @@ def save_backup(servers: list, backup_dir: Path = BACKUP_DIR) -> Path:
 
 def load_backup(filepath: Path) -> dict:
     """Load a backup file."""
+    import orjson
+
+    # Raw bytes straight to orjson, which decodes the UTF-8 as it parses
     if str(filepath).endswith('.gz'):
-        with gzip.open(filepath, 'rt', encoding='utf-8') as f:
-            return json.load(f)
+        with gzip.open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
     else:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
 
 
-def restore_to_postgres(backup_data: dict, dry_run: bool = False):
-    """Restore backup data to PostgreSQL (ADDITIVE ONLY)."""
+def _connect_db():
+    """Open a PostgreSQL connection from the PG* environment variables."""
     import psycopg2
-    from psycopg2.extras import execute_values
 
     DB_CONFIG = {
         "host": os.getenv("PGHOST", "localhost"),
@@ -719,7 +939,45 @@ def restore_to_postgres(backup_data: dict, dry_run: bool = False):
         "user": os.getenv("PGUSER", "postgres"),
         "password": os.getenv("PGPASSWORD"),
     }
+    return psycopg2.connect(**DB_CONFIG)
+
+
+# (column, PostgreSQL type) restored from a backup, in UNNEST argument order
+RESTORE_SERVER_COLUMNS = [
+    ('id', 'uuid'), ('server_name', 'text'), ('ip_address', 'inet'), ('port', 'integer'),
+    ('players_current', 'integer'), ('players_max', 'integer'), ('password_required', 'boolean'),
+    ('terrain', 'text'), ('era', 'text'), ('game_mode', 'text'), ('framework', 'text'),
+    ('discord_url', 'text'), ('srs_address', 'text'), ('mission', 'text'), ('dcs_version', 'text'),
+    ('description', 'text'), ('mission_time_secs', 'integer'), ('language', 'text'),
+    ('website_url', 'text'), ('tacview_address', 'text'), ('gci_url', 'text'),
+    ('qq_group', 'text'), ('teamspeak_address', 'text'), ('last_seen', 'timestamptz'),
+]
+
+RESTORE_SNAPSHOT_COLUMNS = [
+    ('server_id', 'uuid'), ('captured_at', 'timestamptz'), ('players_current', 'integer'),
+    ('players_max', 'integer'), ('mission', 'text'), ('mission_time_secs', 'integer'),
+    ('is_online', 'boolean'),
+]
+
+
+def _restore_columns(rows: List[Dict[str, Any]], columns, defaults: Dict[str, Any]) -> List[list]:
+    """Transpose backup rows into one list per column, for UNNEST.
+
+    Missing keys take the value from defaults, or None. Each row is read
+    with one itemgetter call and zip transposes in C.
+    """
+    names = [col for col, _ in columns]
+    getter = operator.itemgetter(*names)
+    base = {**dict.fromkeys(names), **defaults}
+    return [list(col) for col in zip(*(getter({**base, **row}) for row in rows))]
+
 
+def restore_to_postgres(backup_data: dict, dry_run: bool = False, conn=None):
+    """Restore backup data to PostgreSQL (ADDITIVE ONLY).
+
+    Commits on success. Pass conn to reuse an open connection across
+    restores; otherwise one is opened and closed for this call.
+    """
     servers = backup_data.get("servers", [])
     snapshots = backup_data.get("snapshots", [])
     metadata = backup_data.get("metadata", {})
@@ -733,26 +991,25 @@ def restore_to_postgres(backup_data: dict, dry_run: bool = False):
         print("  [DRY RUN] Would restore to database")
         return
 
-    conn = psycopg2.connect(**DB_CONFIG)
+    owns_conn = conn is None
+    if owns_conn:
+        conn = _connect_db()
     try:
         with conn.cursor() as cur:
+            # One INSERT ... SELECT FROM UNNEST per table: each column is sent
+            # as a single array, so the statement is parsed once per backup
             if servers:
-                server_cols = [
-                    'id', 'server_name', 'ip_address', 'port', 'players_current', 'players_max',
-                    'password_required', 'terrain', 'era', 'game_mode', 'framework',
-                    'discord_url', 'srs_address', 'mission', 'dcs_version', 'description',
-                    'mission_time_secs', 'language', 'website_url', 'tacview_address',
-                    'gci_url', 'qq_group', 'teamspeak_address', 'last_seen'
-                ]
-
-                server_values = []
-                for s in servers:
-                    row = tuple(s.get(col) for col in server_cols)
-                    server_values.append(row)
+                # Sorted so concurrent restores lock rows in the same order
+                servers = sorted(servers, key=lambda s: s.get('id') or '')
+                # Rows carry no last_seen of their own; stamp them with the
+                # backup's capture time so the newer-only guard below holds
+                server_values = _restore_columns(
+                    servers, RESTORE_SERVER_COLUMNS, {'last_seen': metadata.get('captured_at')}
+                )
 
                 upsert_sql = f"""
-                    INSERT INTO servers ({', '.join(server_cols)})
-                    VALUES %s
+                    INSERT INTO servers ({', '.join(col for col, _ in RESTORE_SERVER_COLUMNS)})
+                    SELECT * FROM UNNEST({', '.join(f'%s::{typ}[]' for _, typ in RESTORE_SERVER_COLUMNS)})
                     ON CONFLICT (id) DO UPDATE SET
                         server_name = EXCLUDED.server_name,
                         players_current = EXCLUDED.players_current,
@@ -764,85 +1021,171 @@ def restore_to_postgres(backup_data: dict, dry_run: bool = False):
                        OR EXCLUDED.last_seen > servers.last_seen
                 """
 
-                execute_values(cur, upsert_sql, server_values, page_size=500)
+                cur.execute(upsert_sql, server_values)
                 print(f"  Servers: inserted new / updated only if newer")
 
             if snapshots:
-                snapshot_cols = ['server_id', 'captured_at', 'players_current', 'players_max',
-                                 'mission', 'mission_time_secs', 'is_online']
-
-                snapshot_values = []
-                for s in snapshots:
-                    row = (
-                        s.get('server_id'),
-                        s.get('captured_at'),
-                        s.get('players_current', 0),
-                        s.get('players_max'),
-                        s.get('mission'),
-                        s.get('mission_time_secs'),
-                        s.get('is_online', True),
-                    )
-                    snapshot_values.append(row)
+                snapshots = sorted(snapshots, key=lambda s: (s.get('server_id') or '', s.get('captured_at') or ''))
+                snapshot_values = _restore_columns(
+                    snapshots, RESTORE_SNAPSHOT_COLUMNS, {'players_current': 0, 'is_online': True}
+                )
 
                 insert_sql = f"""
-                    INSERT INTO server_snapshots ({', '.join(snapshot_cols)})
-                    VALUES %s
+                    INSERT INTO server_snapshots ({', '.join(col for col, _ in RESTORE_SNAPSHOT_COLUMNS)})
+                    SELECT * FROM UNNEST({', '.join(f'%s::{typ}[]' for _, typ in RESTORE_SNAPSHOT_COLUMNS)})
                     ON CONFLICT DO NOTHING
                 """
 
-                execute_values(cur, insert_sql, snapshot_values, page_size=500)
+                cur.execute(insert_sql, snapshot_values)
                 print(f"  Snapshots: inserted new only (duplicates skipped)")
 
         conn.commit()
         print("  Restore complete!")
 
     finally:
-        conn.close()
+        if owns_conn:
+            conn.close()
 
 
-def restore_directory(dir_path: Path, dry_run: bool = False):
-    """Restore all backup files from a directory."""
-    backup_files = sorted(dir_path.rglob("*.json.gz"))
+# Per-process connection for restore_directory's worker processes
+_worker_conn = None
 
-    print(f"Found {len(backup_files)} backup files in {dir_path}")
 
-    for i, filepath in enumerate(backup_files, 1):
-        print(f"\n[{i}/{len(backup_files)}] {filepath}")
+def _restore_file(filepath: Path, dry_run: bool) -> str:
+    """Load and restore one backup in a worker process; returns its log output.
+
+    Output is captured so each file's log prints as one block in the parent.
+    """
+    global _worker_conn
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
         try:
-            backup_data = load_backup(filepath)
-            restore_to_postgres(backup_data, dry_run=dry_run)
+            if not dry_run and (_worker_conn is None or _worker_conn.closed):
+                _worker_conn = _connect_db()
+            restore_to_postgres(load_backup(filepath), dry_run=dry_run, conn=_worker_conn)
         except Exception as e:
+            if _worker_conn is not None and not _worker_conn.closed:
+                _worker_conn.rollback()
             print(f"  ERROR: {e}")
+    return out.getvalue()
+
+
+def restore_directory(dir_path: Path, dry_run: bool = False):
+    """Restore all backup files from a directory.
+
+    Order does not matter: each server row is stamped with its backup's
+    captured_at and only overwrites an older last_seen, and duplicate
+    snapshots are skipped. So files are loaded and restored concurrently by
+    a pool of processes, each with its own connection.
+    """
+    backup_files = sorted(dir_path.rglob("*.json.gz"))
+
+    print(f"Found {len(backup_files)} backup files in {dir_path}")
+    if not backup_files:
+        return
+
+    workers = min(8, os.cpu_count() or 1, len(backup_files))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_restore_file, filepath, dry_run): filepath for filepath in backup_files}
+        for i, future in enumerate(as_completed(futures), 1):
+            print(f"\n[{i}/{len(backup_files)}] {futures[future]}")
+            print(future.result(), end="")
+
+
+# Per-directory stats from the last --stats run, inside the backup directory
+BACKUP_STATS_CACHE = ".stats_cache.json"
+
+# Seconds after its last write a backup is assumed complete; a directory
+# holding a newer file is listed again on the next run
+BACKUP_STATS_SETTLE_SECONDS = 60
+
+
+def _dir_stats(path: str, parts: Tuple[str, ...], cache: dict, fresh: dict, settled_before: float) -> list:
+    """[count, size, earliest, latest] of the *.json.gz at or below path.
+
+    A directory's own files are only listed and stat'ed again when its
+    mtime has changed (a file was added, removed or renamed in it), so
+    finished days cost one stat call each instead of one per backup.
+    Writing to an existing file leaves the directory mtime alone, so a
+    directory with a file modified after settled_before is not trusted
+    from the cache (a backup may still have been mid-write).
+    """
+    key = "/".join(parts)
+    mtime_ns = os.stat(path).st_mtime_ns
+    entry = cache.get(key)
+    if entry is None or entry[0] != mtime_ns:
+        count = size = 0
+        settled = True
+        dates = []
+        subdirs = []
+        with os.scandir(path) as it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False):
+                    subdirs.append(e.name)
+                elif e.name.endswith(".json.gz"):
+                    st = e.stat()
+                    count += 1
+                    size += st.st_size
+                    if st.st_mtime >= settled_before:
+                        settled = False
+                    if len(parts) >= 3:
+                        dates.append(f"{parts[0]}-{parts[1]}-{parts[2]} {e.name.replace('.json.gz', '').replace('-', ':')}")
+        # An unsettled entry gets no mtime, so it never matches next time
+        entry = [mtime_ns if settled else None, count, size,
+                 min(dates, default=None), max(dates, default=None), sorted(subdirs)]
+    fresh[key] = entry
+
+    count, size, earliest, latest = entry[1:5]
+    for name in entry[5]:
+        sub_count, sub_size, sub_earliest, sub_latest = _dir_stats(
+            os.path.join(path, name), parts + (name,), cache, fresh, settled_before
+        )
+        count += sub_count
+        size += sub_size
+        if sub_earliest is not None and (earliest is None or sub_earliest < earliest):
+            earliest = sub_earliest
+        if sub_latest is not None and (latest is None or sub_latest > latest):
+            latest = sub_latest
+    return [count, size, earliest, latest]
 
 
 def get_backup_stats(backup_dir: Path = BACKUP_DIR):
     """Get statistics about stored backups."""
+    import time
+    import orjson
+
     if not backup_dir.exists():
         return {"exists": False}
 
-    backup_files = list(backup_dir.rglob("*.json.gz"))
+    cache_path = backup_dir / BACKUP_STATS_CACHE
+    try:
+        cache = orjson.loads(cache_path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        cache = {}
 
-    if not backup_files:
-        return {"exists": True, "count": 0}
+    fresh: dict = {}
+    count, total_size, earliest, latest = _dir_stats(
+        str(backup_dir), (), cache, fresh, time.time() - BACKUP_STATS_SETTLE_SECONDS
+    )
 
-    dates = []
-    total_size = 0
-    for f in backup_files:
-        total_size += f.stat().st_size
+    # Only entries for directories that still exist are written back
+    if fresh != cache:
+        tmp_path = cache_path.with_suffix(".tmp")
         try:
-            parts = f.relative_to(backup_dir).parts
-            if len(parts) >= 4:
-                date_str = f"{parts[0]}-{parts[1]}-{parts[2]} {parts[3].replace('.json.gz', '').replace('-', ':')}"
-                dates.append(date_str)
-        except:
+            tmp_path.write_bytes(orjson.dumps(fresh))
+            os.replace(tmp_path, cache_path)
+        except OSError:
             pass
 
+    if not count:
+        return {"exists": True, "count": 0}
+
     return {
         "exists": True,
-        "count": len(backup_files),
+        "count": count,
         "total_size_mb": round(total_size / (1024 * 1024), 2),
-        "earliest": min(dates) if dates else None,
-        "latest": max(dates) if dates else None,
+        "earliest": earliest,
+        "latest": latest,
         "backup_dir": str(backup_dir),
     }
 
@@ -851,10 +1194,10 @@ def get_backup_stats(backup_dir: Path = BACKUP_DIR):
 # Main execution
 # ============================================================================
 
-def run_once():
+def run_once(browser=None):
     """Run a single backup fetch."""
     try:
-        servers = fetch_servers_data()
+        servers = fetch_servers_data(browser)
         if servers:
             filepath = save_backup(servers)
             print(f"[{datetime.now()}] Backup saved: {filepath}")
@@ -873,15 +1216,18 @@ def run_once():
 
 def run_loop(interval_minutes: int):
     """Run backup fetches in a continuous loop."""
-    import time
     import signal
+    import threading
+    import time
+    from playwright.sync_api import sync_playwright
 
-    running = True
+    # Set by the signal handler; the wait between fetches returns as soon
+    # as it is, instead of polling a flag every second
+    stop_event = threading.Event()
 
     def handle_signal(signum, frame):
-        nonlocal running
         print(f"\n[{datetime.now()}] Received signal {signum}, shutting down...")
-        running = False
+        stop_event.set()
 
     signal.signal(signal.SIGINT, handle_signal)
     signal.signal(signal.SIGTERM, handle_signal)
@@ -893,26 +1239,48 @@ def run_loop(interval_minutes: int):
     fetch_count = 0
     error_count = 0
 
-    while running:
-        fetch_count += 1
-        print(f"--- Fetch #{fetch_count} ---")
+    # One Chromium for the whole loop instead of a cold start per fetch;
+    # relaunched when it dies or gets old
+    with sync_playwright() as p:
+        browser = None
+        launched_at = 0.0
 
-        if run_once():
-            pass
-        else:
-            error_count += 1
+        while not stop_event.is_set():
+            fetch_count += 1
+            print(f"--- Fetch #{fetch_count} ---")
 
-        if not running:
-            break
+            if browser is not None and (
+                not browser.is_connected()
+                or time.monotonic() - launched_at > BROWSER_RECYCLE_SECONDS
+            ):
+                with contextlib.suppress(Exception):
+                    browser.close()
+                browser = None
 
-        next_run = datetime.now().replace(microsecond=0) + timedelta(minutes=interval_minutes)
-        print(f"  Next fetch at: {next_run.strftime('%H:%M:%S')}\n")
+            try:
+                if browser is None:
+                    browser = _launch_browser(p)
+                    launched_at = time.monotonic()
+                ok = run_once(browser)
+            except Exception as e:
+                print(f"[{datetime.now()}] ERROR: Could not launch browser: {e}")
+                ok = False
+
+            if not ok:
+                error_count += 1
+
+            if stop_event.is_set():
+                break
+
+            next_run = datetime.now().replace(microsecond=0) + timedelta(minutes=interval_minutes)
+            print(f"  Next fetch at: {next_run.strftime('%H:%M:%S')}\n")
 
-        sleep_seconds = interval_minutes * 60
-        for _ in range(sleep_seconds):
-            if not running:
+            if stop_event.wait(timeout=interval_minutes * 60):
                 break
-            time.sleep(1)
+
+        if browser is not None:
+            with contextlib.suppress(Exception):
+                browser.close()
 
     print(f"\n[{datetime.now()}] Shutdown complete")
     print(f"  Total fetches: {fetch_count}")
@@ -6,21 +6,41 @@ Usage:
 """
 
 import argparse
-import json
+import functools
+import gzip
 import os
 import re
 import sys
 import unicodedata
 from typing import Any, Dict, List, Optional, Tuple
 
+import orjson
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 
 URL = "https://www.digitalcombatsimulator.com/en/personal/server/#allservers"
+
+# Compiled once; these run on every row of every fetch
+_PLAYERS_RE = re.compile(r"(\d+)\s*/\s*(\d+)")
+_NUMS_RE = re.compile(r"\d+")
+_DAYS_RE = re.compile(r"(\d+)\s*d", re.IGNORECASE)
+
+
+# Drops the control/format characters scraped text actually contains (all
+# in Unicode category C) and turns no-break spaces into spaces
+_CONTROL_TABLE = dict.fromkeys([*range(0x20), *range(0x7f, 0xa0), *range(0x200b, 0x2010), 0xfeff])
+_CONTROL_TABLE[0xa0] = " "
+
+
 def _clean(text: str) -> str:
     if text is None:
         return ""
-    text = text.replace("\u00a0", " ")
-    text = "".join(ch for ch in text if unicodedata.category(ch)[0] != "C")
+    # isprintable() is False for every category C character (and for
+    # no-break spaces), so most strings skip both passes; the category
+    # scan only runs for characters the table does not cover
+    if not text.isprintable():
+        text = text.translate(_CONTROL_TABLE)
+        if not text.isprintable():
+            text = "".join(ch for ch in text if unicodedata.category(ch)[0] != "C")
     return " ".join(text.split()).strip()
 
 
@@ -54,28 +74,164 @@ def _load_env(path: str = ".env") -> Tuple[bool, List[str]]:
         return False, []
 
 
-def _login_form_is_visible(page) -> bool:
-    return bool(
-        page.evaluate(
-            """
-            () => {
-                const forms = Array.from(
-                    document.querySelectorAll('form.bx_auth_form, form[name="system_auth_form"], form[action*="/personal/server/"]')
-                );
-                for (const form of forms) {
-                    const user = form.querySelector('#USER_LOGIN, input[name="USER_LOGIN"]');
-                    const passw = form.querySelector('#USER_PASSWORD, input[name="USER_PASSWORD"]');
-                    if (!user || !passw) continue;
-                    const style = window.getComputedStyle(form);
-                    const visible = style && style.display !== 'none' && style.visibility !== 'hidden' && style.opacity !== '0';
-                    const userVisible = user.offsetParent !== null;
-                    if (visible && userVisible) return true;
-                }
-                return false;
+# Page scripts, sent as-is to page.evaluate / wait_for_function. Kept as
+# module constants so the loop below does not rebuild them per page.
+_LOGIN_VISIBLE_JS = """
+    () => {
+        const forms = Array.from(
+            document.querySelectorAll('form.bx_auth_form, form[name="system_auth_form"], form[action*="/personal/server/"]')
+        );
+        for (const form of forms) {
+            const user = form.querySelector('#USER_LOGIN, input[name="USER_LOGIN"]');
+            const passw = form.querySelector('#USER_PASSWORD, input[name="USER_PASSWORD"]');
+            if (!user || !passw) continue;
+            const style = window.getComputedStyle(form);
+            const visible = style && style.display !== 'none' && style.visibility !== 'hidden' && style.opacity !== '0';
+            const userVisible = user.offsetParent !== null;
+            if (visible && userVisible) return true;
+        }
+        return false;
+    }
+"""
+
+_ROWS_READY_JS = """
+    () => {
+        const root = document.querySelector('#allservers') || document.body;
+        const table = root.querySelector('#servers') || root.querySelector('table') || document.querySelector('#servers') || document.querySelector('table');
+        if (!table) return false;
+            const rows = Array.from(table.querySelectorAll('tbody tr'));
+            if (!rows.length) return false;
+            return rows.some(r => {
+                const cell = r.querySelector('td');
+                if (!cell) return false;
+                let text = (cell.innerText || cell.textContent || '').trim();
+                text = text.replace(/[\\x00-\\x1f\\x7f\\u200b-\\u200f\\ufeff]/g, '').trim();
+                return text.length > 0;
+            });
+        }
+"""
+
+_PAGE_SIGNATURE_JS = """
+    () => {
+        const info = document.querySelector('#servers_info');
+        const infoText = info ? info.innerText.trim() : '';
+        const root = document.querySelector('#allservers') || document.body;
+        const table = root.querySelector('#servers') || root.querySelector('table');
+        const cell = table ? table.querySelector('tbody tr td') : null;
+        let cellText = cell ? (cell.innerText || cell.textContent || '') : '';
+        cellText = cellText.replace(/[\\x00-\\x1f\\x7f\\u200b-\\u200f\\ufeff]/g, '').trim();
+        return `${infoText}|${cellText}`;
+    }
+"""
+
+_HAS_NEXT_PAGE_JS = """
+    () => {
+        const li = document.querySelector('#servers_next');
+        if (!li) return false;
+        return !li.classList.contains('disabled');
+    }
+"""
+
+_GO_NEXT_PAGE_JS = """
+    () => {
+        if (window.jQuery && window.jQuery.fn && window.jQuery.fn.dataTable) {
+            const table = window.jQuery('#servers').DataTable();
+            table.page('next').draw('page');
+            return true;
+        }
+        const a = document.querySelector('#servers_next a');
+        if (!a) return false;
+        a.click();
+        return true;
+    }
+"""
+
+_SET_PAGE_LENGTH_JS = """
+    () => {
+        const sel = document.querySelector('#servers_length select, select[name="servers_length"]');
+        if (!sel) return null;
+        const vals = Array.from(sel.options)
+            .map(o => parseInt(o.value, 10))
+            .filter(v => Number.isFinite(v));
+        if (!vals.length) return null;
+        // DataTables' "All" option (-1) puts every row on one page
+        const len = vals.includes(-1) ? -1 : Math.max(...vals);
+        if (sel.value !== String(len)) {
+            sel.value = String(len);
+            sel.dispatchEvent(new Event('change', { bubbles: true }));
+        }
+        return len;
+    }
+"""
+
+_TABLE_DATA_JS = """
+    () => {
+        const root = document.querySelector('#allservers') || document.body;
+        const table = root.querySelector('#servers') || root.querySelector('table') || document.querySelector('#servers') || document.querySelector('table');
+        if (!table) return null;
+
+        const headers = Array.from(table.querySelectorAll('thead th, thead td')).map(th =>
+            (th.innerText || th.textContent || '').trim()
+        );
+        const clean = (value) => {
+            if (!value) return '';
+            return String(value)
+                .replace(/[\\x00-\\x1f\\x7f\\u200b-\\u200f\\ufeff]/g, '')
+                .replace(/\\u00a0/g, ' ')
+                .trim();
+        };
+        const cellText = (td) => {
+            const text = (td.innerText || '').trim()
+                || (td.textContent || '').trim()
+                || (td.getAttribute('data-value') || '').trim()
+                || (td.getAttribute('title') || '').trim();
+            return clean(text);
+        };
+
+        const rows = [];
+        const trs = Array.from(table.querySelectorAll('tbody tr'));
+        for (const tr of trs) {
+            if (tr.classList.contains('child')) {
+                const prev = rows[rows.length - 1];
+                if (!prev) continue;
+                const items = tr.querySelectorAll('li');
+                items.forEach(li => {
+                    const title = clean(li.querySelector('.dtr-title')?.innerText || '');
+                    const data = clean(li.querySelector('.dtr-data')?.innerText || '');
+                    if (!title) return;
+                    if (!prev[title] || !String(prev[title]).trim()) {
+                        prev[title] = data;
+                    }
+                });
+                continue;
             }
-            """
-        )
-    )
+
+            const cells = Array.from(tr.querySelectorAll('td'));
+            if (!cells.length) continue;
+            const obj = {};
+            cells.forEach((td, idx) => {
+                const key = headers[idx] || `col${idx + 1}`;
+                obj[key] = cellText(td);
+            });
+            rows.push(obj);
+        }
+
+        if (!rows.length) return null;
+
+        return rows;
+    }
+"""
+
+# Signature and next-button state in one round trip per page
+_PAGE_STATE_JS = (
+    "() => ({ sig: (" + _PAGE_SIGNATURE_JS + ")(), hasNext: (" + _HAS_NEXT_PAGE_JS + ")() })"
+)
+
+_SIGNATURE_CHANGED_JS = "(prev) => (" + _PAGE_SIGNATURE_JS + ")() !== prev"
+
+
+def _login_form_is_visible(page) -> bool:
+    return bool(page.evaluate(_LOGIN_VISIBLE_JS))
 
 
 def _submit_login_form(page, user: str, password: str) -> bool:
@@ -121,103 +277,47 @@ def _submit_login_form(page, user: str, password: str) -> bool:
 
 
 def _wait_for_rows(page, timeout_ms: int) -> None:
-    page.wait_for_function(
-        """
-        () => {
-            const root = document.querySelector('#allservers') || document.body;
-            const table = root.querySelector('#servers') || root.querySelector('table') || document.querySelector('#servers') || document.querySelector('table');
-            if (!table) return false;
-                const rows = Array.from(table.querySelectorAll('tbody tr'));
-                if (!rows.length) return false;
-                return rows.some(r => {
-                    const cell = r.querySelector('td');
-                    if (!cell) return false;
-                    let text = (cell.innerText || cell.textContent || '').trim();
-                    text = text.replace(/[\\x00-\\x1f\\x7f\\u200b-\\u200f\\ufeff]/g, '').trim();
-                    return text.length > 0;
-                });
-            }
-            """,
-        timeout=timeout_ms,
-    )
+    page.wait_for_function(_ROWS_READY_JS, timeout=timeout_ms)
 
 
 def _page_signature(page) -> str:
-    return page.evaluate(
-        """
-        () => {
-            const info = document.querySelector('#servers_info');
-            const infoText = info ? info.innerText.trim() : '';
-            const root = document.querySelector('#allservers') || document.body;
-            const table = root.querySelector('#servers') || root.querySelector('table');
-            const cell = table ? table.querySelector('tbody tr td') : null;
-            let cellText = cell ? (cell.innerText || cell.textContent || '') : '';
-            cellText = cellText.replace(/[\\x00-\\x1f\\x7f\\u200b-\\u200f\\ufeff]/g, '').trim();
-            return `${infoText}|${cellText}`;
-        }
-        """
-    )
+    return page.evaluate(_PAGE_SIGNATURE_JS)
 
 
 def _set_page_length(page, debug: bool) -> Optional[int]:
-    value = page.evaluate(
-        """
-        () => {
-            const sel = document.querySelector('#servers_length select, select[name="servers_length"]');
-            if (!sel) return null;
-            const vals = Array.from(sel.options)
-                .map(o => parseInt(o.value, 10))
-                .filter(v => Number.isFinite(v));
-            if (!vals.length) return null;
-            const max = Math.max(...vals);
-            if (sel.value !== String(max)) {
-                sel.value = String(max);
-                sel.dispatchEvent(new Event('change', { bubbles: true }));
-            }
-            return max;
-        }
-        """
-    )
+    value = page.evaluate(_SET_PAGE_LENGTH_JS)
     if value:
         _debug(debug, f"Set page length to {value}")
     return value
 
 
-def _has_next_page(page) -> bool:
-    return bool(
-        page.evaluate(
-            """
-            () => {
-                const li = document.querySelector('#servers_next');
-                if (!li) return false;
-                return !li.classList.contains('disabled');
-            }
-            """
-        )
-    )
+def _page_state(page) -> Tuple[str, bool]:
+    state = page.evaluate(_PAGE_STATE_JS)
+    return state["sig"], bool(state["hasNext"])
 
 
 def _go_next_page(page) -> bool:
-    return bool(
-        page.evaluate(
-            """
-            () => {
-                if (window.jQuery && window.jQuery.fn && window.jQuery.fn.dataTable) {
-                    const table = window.jQuery('#servers').DataTable();
-                    table.page('next').draw('page');
-                    return true;
-                }
-                const a = document.querySelector('#servers_next a');
-                if (!a) return false;
-                a.click();
-                return true;
-            }
-            """
-        )
-    )
+    return bool(page.evaluate(_GO_NEXT_PAGE_JS))
+
+
+def _row_key(row: Dict[str, Any]) -> Tuple:
+    """Hashable dedup key for a scraped row, equal for rows with equal content.
+
+    Table rows are all strings; any other value (from JSON responses) is
+    keyed by its repr, tagged so it can never collide with a string.
+    """
+    return tuple(sorted(
+        (k, v) if type(v) is str else (k, None, repr(v))
+        for k, v in row.items()
+    ))
 
 
-def _extract_all_pages(page, timeout_ms: int, debug: bool) -> Optional[List[Dict[str, str]]]:
+def _extract_all_pages(page, timeout_ms: int, debug: bool) -> Tuple[Optional[List[Dict[str, str]]], set]:
+    """Read every page of the server table.
+
+    Returns (rows or None, the set of _row_key values of those rows), so
+    callers can merge more rows without re-keying these.
+    """
     all_rows: List[Dict[str, str]] = []
     seen = set()
     page_count = 0
@@ -226,85 +326,63 @@ def _extract_all_pages(page, timeout_ms: int, debug: bool) -> Optional[List[Dict
         _wait_for_rows(page, timeout_ms)
     except PlaywrightTimeoutError:
         _debug(debug, "Timed out waiting for initial rows")
-        return None
+        return None, seen
 
     signature = _page_signature(page)
     if _set_page_length(page, debug):
         try:
             page.wait_for_function(
-                "(prev) => {"
-                "const info = document.querySelector('#servers_info');"
-                "const infoText = info ? info.innerText.trim() : '';"
-                "const root = document.querySelector('#allservers') || document.body;"
-                "const table = root.querySelector('#servers') || root.querySelector('table');"
-                "const cell = table ? table.querySelector('tbody tr td') : null;"
-                "let cellText = cell ? (cell.innerText || cell.textContent || '') : '';"
-                "cellText = cellText.replace(/[\\x00-\\x1f\\x7f\\u200b-\\u200f\\ufeff]/g, '').trim();"
-                "const sig = `${infoText}|${cellText}`;"
-                "return sig !== prev;"
-                "}",
+                _SIGNATURE_CHANGED_JS,
                 arg=signature,
                 timeout=timeout_ms,
             )
         except PlaywrightTimeoutError:
             _debug(debug, "Page length change did not update table")
-        signature = _page_signature(page)
 
+    signature, has_next = _page_state(page)
     while True:
         page_count += 1
         rows = _extract_table_data(page) or []
         rows = [row for row in rows if _row_has_data(row)]
         _debug(debug, f"Page {page_count}: {len(rows)} rows")
         for row in rows:
-            key = json.dumps(row, sort_keys=True, ensure_ascii=True)
+            key = _row_key(row)
             if key not in seen:
                 seen.add(key)
                 all_rows.append(row)
 
-        if not _has_next_page(page):
+        if not has_next:
             break
 
         before = signature
         if not _go_next_page(page):
             _debug(debug, "Next page control not found")
             break
-        try:
-            page.wait_for_load_state("networkidle", timeout=timeout_ms)
-        except PlaywrightTimeoutError:
-            pass
+        # No networkidle wait: paging is client-side, and the signature
+        # check below is the actual completion signal
         try:
             page.wait_for_function(
-                "(prev) => {"
-                "const info = document.querySelector('#servers_info');"
-                "const infoText = info ? info.innerText.trim() : '';"
-                "const root = document.querySelector('#allservers') || document.body;"
-                "const table = root.querySelector('#servers') || root.querySelector('table');"
-                "const cell = table ? table.querySelector('tbody tr td') : null;"
-                "let cellText = cell ? (cell.innerText || cell.textContent || '') : '';"
-                "cellText = cellText.replace(/[\\x00-\\x1f\\x7f\\u200b-\\u200f\\ufeff]/g, '').trim();"
-                "const sig = `${infoText}|${cellText}`;"
-                "return sig !== prev;"
-                "}",
+                _SIGNATURE_CHANGED_JS,
                 arg=before,
                 timeout=timeout_ms,
             )
         except PlaywrightTimeoutError:
             _debug(debug, "Pagination click did not change first row")
             break
-        signature = _page_signature(page)
+        signature, has_next = _page_state(page)
 
     _debug(debug, f"Pagination complete: pages={page_count}, rows={len(all_rows)}")
-    return all_rows or None
+    return all_rows or None, seen
 
 
 def _parse_players(value: str) -> Tuple[Optional[int], Optional[int]]:
     if not value:
         return None, None
     value = _clean(value)
-    match = re.search(r"(\d+)\s*/\s*(\d+)", value)
+    match = _PLAYERS_RE.search(value)
     if match:
         return int(match.group(1)), int(match.group(2))
-    nums = re.findall(r"\d+", value)
+    nums = _NUMS_RE.findall(value)
     if len(nums) == 1:
         return int(nums[0]), None
     if len(nums) >= 2:
@@ -317,23 +395,22 @@ def _parse_hms(value: str) -> Optional[int]:
         return None
     cleaned = _clean(value)
     days = 0
-    match = re.search(r"(\d+)\s*d", cleaned, re.IGNORECASE)
-    if match:
-        days = int(match.group(1))
-        cleaned = cleaned.replace(match.group(0), "").strip()
+    # Most values are plain H:M:S; only look for a day count when one can exist
+    if "d" in cleaned or "D" in cleaned:
+        match = _DAYS_RE.search(cleaned)
+        if match:
+            days = int(match.group(1))
+            cleaned = cleaned.replace(match.group(0), "").strip()
     if not cleaned:
         return days * 86400 if days else None
     parts = cleaned.split(":")
-    if not all(p.isdigit() for p in parts):
+    if len(parts) > 3 or not all(p.isdigit() for p in parts):
         return None
-    nums = [int(p) for p in parts]
-    if len(nums) == 3:
-        return days * 86400 + nums[0] * 3600 + nums[1] * 60 + nums[2]
-    if len(nums) == 2:
-        return days * 86400 + nums[0] * 60 + nums[1]
-    if len(nums) == 1:
-        return days * 86400 + nums[0]
-    return None
+    # [[H:]M:]S, accumulated base-60
+    seconds = 0
+    for part in parts:
+        seconds = seconds * 60 + int(part)
+    return days * 86400 + seconds
 
 
 def _row_has_data(row: Dict[str, Any]) -> bool:
@@ -344,45 +421,107 @@ def _normalized_has_core_fields(row: Dict[str, Any]) -> bool:
     return bool(row.get("server_name") or row.get("ip_address") or row.get("port"))
 
 
+# Header aliases per output field, in priority order, and the positional
+# column used when none of them yields a value
+_FIELD_ALIASES: Dict[str, Tuple[Tuple[str, ...], str]] = {
+    "server_name": (("server name", "server_name", "servername", "name"), "col1"),
+    "ip_address": (("ip address", "ip", "address", "host", "server ip"), "col4"),
+    "port": (("port", "server port"), "col5"),
+    "players": (("players", "slots"), "col6"),
+    "password": (("pass.", "pass", "password", "password required", "locked"), "col7"),
+    "mission": (("mission", "current mission", "scenario"), "col8"),
+    "mission_time": (("mission time", "time", "uptime"), "col9"),
+    "description": (("description", "desc"), "col2"),
+    "dcs_version": (("dcs version", "version"), "col3"),
+}
+
+# Inverted: lowercased header -> (field, priority); fallback columns rank last
+_ALIAS_INDEX: Dict[str, Tuple[str, int]] = {}
+for _field, (_aliases, _fallback) in _FIELD_ALIASES.items():
+    for _rank, _alias in enumerate(_aliases):
+        _ALIAS_INDEX[_alias] = (_field, _rank)
+    _ALIAS_INDEX[_fallback] = (_field, len(_aliases))
+
+
+@functools.lru_cache(maxsize=256)
+def _header_alias(header: str) -> Optional[Tuple[str, int]]:
+    """(field, priority) for a raw table header, or None if it is not an alias.
+
+    Cached: every row of a fetch repeats the same handful of headers.
+    """
+    return _ALIAS_INDEX.get(_clean(header).lower())
+
+
+# Plan entry for a field with no matching header; row.get() of it is None
+_NO_KEY = object()
+
+
+@functools.lru_cache(maxsize=64)
+def _row_plan(keys: Tuple[Any, ...]) -> Dict[str, Tuple[Any, Any]]:
+    """Per output field, the row key to read and the colN key to fall back to.
+
+    Which header wins depends only on the headers, and every row of a table
+    has the same ones, so this is worked out once per table, not per row:
+    the best-ranked alias present and, among duplicate headers, the last one.
+    """
+    found: Dict[str, Tuple[int, Any]] = {}
+    fallback: Dict[str, Any] = {}
+    for k in keys:
+        hit = _header_alias(str(k))
+        if hit is None:
+            continue
+        field, rank = hit
+        if rank == len(_FIELD_ALIASES[field][0]):
+            fallback[field] = k
+        elif field not in found or rank <= found[field][0]:
+            found[field] = (rank, k)
+    return {
+        field: (found[field][1] if field in found else _NO_KEY, fallback.get(field, _NO_KEY))
+        for field in _FIELD_ALIASES
+    }
+
+
+def _pick(row: Dict[str, Any], plan: Dict[str, Tuple[Any, Any]], field: str) -> str:
+    key, fallback_key = plan[field]
+    val = row.get(key)
+    text = _clean(str(val)) if val is not None else ""
+    if not text:
+        val = row.get(fallback_key)
+        if val is not None:
+            text = _clean(str(val))
+    return text
+
+
+def _raw_has_core_fields(row: Dict[str, Any]) -> bool:
+    """Same answer as _normalized_has_core_fields(_normalize_row(row)), cheaper.
+
+    Only the name, address and port are looked at, so rows that would be
+    dropped anyway are not fully normalized first.
+    """
+    plan = _row_plan(tuple(row))
+    if _pick(row, plan, "server_name") or _pick(row, plan, "ip_address"):
+        return True
+    try:
+        return bool(int(_pick(row, plan, "port") or 0))
+    except ValueError:
+        return False
+
+
 def _normalize_row(row: Dict[str, Any]) -> Dict[str, Any]:
-    lower = {_clean(str(k)).lower(): v for k, v in row.items()}
-
-    def pick(*names: str) -> str:
-        for name in names:
-            key = name.strip().lower()
-            if key in lower:
-                val = lower[key]
-                return _clean(str(val)) if val is not None else ""
-        return ""
+    plan = _row_plan(tuple(row))
+
+    def pick(field: str) -> str:
+        return _pick(row, plan, field)
 
-    server_name = pick("server name", "server_name", "servername", "name")
-    ip_address = pick("ip address", "ip", "address", "host", "server ip")
-    port_raw = pick("port", "server port")
-    players_raw = pick("players", "slots")
-    pass_raw = pick("pass.", "pass", "password", "password required", "locked")
-    mission = pick("mission", "current mission", "scenario")
-    mission_time = pick("mission time", "time", "uptime")
-    description = pick("description", "desc")
-    dcs_version = pick("dcs version", "version")
-
-    if not server_name:
-        server_name = pick("col1")
-    if not description:
-        description = pick("col2")
-    if not dcs_version:
-        dcs_version = pick("col3")
-    if not ip_address:
-        ip_address = pick("col4")
-    if not port_raw:
-        port_raw = pick("col5")
-    if not players_raw:
-        players_raw = pick("col6")
-    if not pass_raw:
-        pass_raw = pick("col7")
-    if not mission:
-        mission = pick("col8")
-    if not mission_time:
-        mission_time = pick("col9")
+    server_name = pick("server_name")
+    ip_address = pick("ip_address")
+    port_raw = pick("port")
+    players_raw = pick("players")
+    pass_raw = pick("password")
+    mission = pick("mission")
+    mission_time = pick("mission_time")
+    description = pick("description")
+    dcs_version = pick("dcs_version")
 
     try:
         port = int(port_raw) if port_raw else None
@@ -416,65 +555,7 @@ def _normalize_row(row: Dict[str, Any]) -> Dict[str, Any]:
 
 def _extract_table_data(page) -> Optional[List[Dict[str, str]]]:
     """Extract server data from the visible table in the #allservers section."""
-    return page.evaluate(
-        """
-        () => {
-            const root = document.querySelector('#allservers') || document.body;
-            const table = root.querySelector('#servers') || root.querySelector('table') || document.querySelector('#servers') || document.querySelector('table');
-            if (!table) return null;
-
-            const headers = Array.from(table.querySelectorAll('thead th, thead td')).map(th =>
-                (th.innerText || th.textContent || '').trim()
-            );
-            const clean = (value) => {
-                if (!value) return '';
-                return String(value)
-                    .replace(/[\\x00-\\x1f\\x7f\\u200b-\\u200f\\ufeff]/g, '')
-                    .replace(/\\u00a0/g, ' ')
-                    .trim();
-            };
-            const cellText = (td) => {
-                const text = (td.innerText || '').trim()
-                    || (td.textContent || '').trim()
-                    || (td.getAttribute('data-value') || '').trim()
-                    || (td.getAttribute('title') || '').trim();
-                return clean(text);
-            };
-
-            const rows = [];
-            const trs = Array.from(table.querySelectorAll('tbody tr'));
-            for (const tr of trs) {
-                if (tr.classList.contains('child')) {
-                    const prev = rows[rows.length - 1];
-                    if (!prev) continue;
-                    const items = tr.querySelectorAll('li');
-                    items.forEach(li => {
-                        const title = clean(li.querySelector('.dtr-title')?.innerText || '');
-                        const data = clean(li.querySelector('.dtr-data')?.innerText || '');
-                        if (!title) return;
-                        if (!prev[title] || !String(prev[title]).trim()) {
-                            prev[title] = data;
-                        }
-                    });
-                    continue;
-                }
-
-                const cells = Array.from(tr.querySelectorAll('td'));
-                if (!cells.length) continue;
-                const obj = {};
-                cells.forEach((td, idx) => {
-                    const key = headers[idx] || `col${idx + 1}`;
-                    obj[key] = cellText(td);
-                });
-                rows.push(obj);
-            }
-
-            if (!rows.length) return null;
-
-            return rows;
-        }
-        """
-    )
+    return page.evaluate(_TABLE_DATA_JS)
 
 
 def _extract_json_rows(candidate: Any) -> Optional[List[Dict[str, Any]]]:
@@ -501,11 +582,36 @@ def _maybe_pick_json(candidate: Any, best: Tuple[int, Optional[Any]]) -> Tuple[i
     return best
 
 
+def _parse_json_bodies(bodies: List[bytes]) -> Tuple[Optional[Any], List[Dict[str, Any]], List[Tuple]]:
+    """Parse captured JSON responses: (best candidate, deduplicated rows, their keys)."""
+    best: Tuple[int, Optional[Any]] = (-1, None)
+    rows_out: List[Dict[str, Any]] = []
+    keys: List[Tuple] = []
+    seen = set()
+    for body in bodies:
+        try:
+            data = orjson.loads(body)
+            best = _maybe_pick_json(data, best)
+            for row in _extract_json_rows(data) or ():
+                key = _row_key(row)
+                if key in seen:
+                    continue
+                seen.add(key)
+                rows_out.append(row)
+                keys.append(key)
+        except Exception:
+            continue
+    return best[1], rows_out, keys
+
+
 def main() -> int:
+    # Before the parser is built, so its credential defaults see .env values
+    env_found, env_keys = _load_env()
+
     parser = argparse.ArgumentParser(description="Fetch DCS server list after logging in.")
     parser.add_argument("--user", default=os.getenv("DCS_USERNAME"), help="DCS username (or set DCS_USERNAME)")
     parser.add_argument("--password", default=os.getenv("DCS_PASSWORD"), help="DCS password (or set DCS_PASSWORD)")
-    parser.add_argument("--out", default="servers.json", help="Output JSON path")
+    parser.add_argument("--out", default="servers.json", help="Output JSON path (gzip-compressed if it ends in .gz)")
     parser.add_argument("--raw", action="store_true", help="Write raw table data without normalization")
     parser.add_argument("--debug", action="store_true", help="Print debug information to stderr")
     parser.add_argument("--headful", action="store_true", help="Run with a visible browser window")
@@ -515,7 +621,6 @@ def main() -> int:
     args = parser.parse_args()
 
     debug = args.debug
-    env_found, env_keys = _load_env()
     if debug:
         if env_found:
             keys = ", ".join(env_keys) if env_keys else "none"
@@ -523,45 +628,27 @@ def main() -> int:
         else:
             _debug(True, "No .env file found")
 
-    if not args.user:
-        args.user = os.getenv("DCS_USERNAME")
-    if not args.password:
-        args.password = os.getenv("DCS_PASSWORD")
-
     _info(f"Credentials present: user={'yes' if args.user else 'no'}, password={'yes' if args.password else 'no'}")
 
     if not args.user or not args.password:
         print("Missing credentials. Provide --user/--password or set DCS_USERNAME/DCS_PASSWORD.")
         return 2
 
-    best_json: Tuple[int, Optional[Any]] = (-1, None)
-    json_rows: List[Dict[str, Any]] = []
-    json_seen = set()
+    # Response bodies are only collected while the page is driven; parsing
+    # them waits until the table has been scraped
+    json_bodies: List[bytes] = []
 
     with sync_playwright() as p:
         _info(f"Launching Chromium (headless={not args.headful})")
         browser = p.chromium.launch(headless=not args.headful)
         page = browser.new_page()
 
-        def _add_json_rows(rows: List[Dict[str, Any]]) -> None:
-            for row in rows:
-                key = json.dumps(row, sort_keys=True, ensure_ascii=True)
-                if key in json_seen:
-                    continue
-                json_seen.add(key)
-                json_rows.append(row)
-
         def on_response(resp):
-            nonlocal best_json
             try:
                 ct = resp.headers.get("content-type", "")
                 if "application/json" not in ct:
                     return
-                data = resp.json()
-                best_json = _maybe_pick_json(data, best_json)
-                rows = _extract_json_rows(data)
-                if rows:
-                    _add_json_rows(rows)
+                json_bodies.append(resp.body())
             except Exception:
                 return
 
@@ -592,9 +679,10 @@ def main() -> int:
         except PlaywrightTimeoutError:
             pass
 
-        data = _extract_all_pages(page, args.timeout, debug)
+        data, page_seen = _extract_all_pages(page, args.timeout, debug)
         _info(f"Table data extracted: {bool(data)}")
 
+        best_json, json_rows, json_keys = _parse_json_bodies(json_bodies)
         if json_rows:
             _debug(debug, f"Captured JSON rows: {len(json_rows)}")
 
@@ -604,18 +692,13 @@ def main() -> int:
 
         if data is None:
             # Fallback to the best JSON response we saw
-            data = best_json[1]
+            data = best_json
             _info(f"Fallback JSON used: {bool(data)}")
         elif json_rows and len(json_rows) > len(data):
-            merged_seen = set()
-            merged: List[Dict[str, Any]] = []
-            for row in data + json_rows:
-                key = json.dumps(row, sort_keys=True, ensure_ascii=True)
-                if key in merged_seen:
-                    continue
-                merged_seen.add(key)
-                merged.append(row)
-            data = merged
+            # Both sides are already deduplicated, with their keys kept
+            data = data + [
+                row for row, key in zip(json_rows, json_keys) if key not in page_seen
+            ]
             _info(f"Merged table rows with JSON rows: {len(data)} total")
 
         if data is None:
@@ -638,11 +721,15 @@ def main() -> int:
             data_list = list(data)
 
         if not args.raw:
-            data_list = [_normalize_row(row) for row in data_list]
-            data_list = [row for row in data_list if _normalized_has_core_fields(row)]
+            data_list = [_normalize_row(row) for row in data_list if _raw_has_core_fields(row)]
 
-        with open(args.out, "w", encoding="utf-8") as f:
-            json.dump(data_list, f, indent=2, ensure_ascii=False)
+        if args.out.endswith(".gz"):
+            # Compressed output is for machines: compact, fastest gzip level
+            with gzip.open(args.out, "wb", compresslevel=1) as f:
+                f.write(orjson.dumps(data_list))
+        else:
+            with open(args.out, "wb") as f:
+                f.write(orjson.dumps(data_list, option=orjson.OPT_INDENT_2))
 
         browser.close()
 
@@ -8,7 +8,10 @@ Usage:
 """
 
 import argparse
+import functools
+import gzip
 import hashlib
+import ipaddress
 import platform
 import json
 import os
@@ -17,11 +20,13 @@ import subprocess
 import re
 import time
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import psycopg2
+from psycopg2.extras import execute_values
 from dotenv import load_dotenv
 
 
@@ -37,6 +42,9 @@ DB_CONFIG = {
     "password": os.getenv("PGPASSWORD"),
 }
 
+# Concurrent pings for --ping (each is a subprocess or TCP connect wait)
+PING_WORKERS = 32
+
 
 # =============================================================================
 # Enrichment Patterns
@@ -118,23 +126,73 @@ MODE_PATTERNS = {
     "training": [r"\btraining\b", r"\btrain\b", r"\b训练\b", r"\bpractice\b", r"\b萌新\b"],
 }
 
+# Words of a text as the regex engine sees them. r"\bword\b" matches exactly
+# when word is one of these runs, so such patterns become dict lookups.
+WORD_RE = re.compile(r"\w+")
+
+
+def _compile_table(table: Dict[str, List[str]]) -> Tuple[List[str], Dict[str, int], List[Tuple[int, re.Pattern]]]:
+    """Compile a pattern table to (categories, literal word -> category index,
+    [(category index, alternation of its other patterns)])."""
+    categories = list(table)
+    word_index: Dict[str, int] = {}
+    regexes = []
+    for index, patterns in enumerate(table.values()):
+        rest = []
+        for pattern in patterns:
+            literal = re.fullmatch(r"\\b(\w+)\\b", pattern)
+            if literal:
+                word_index.setdefault(literal.group(1), index)
+            else:
+                rest.append(pattern)
+        if rest:
+            regexes.append((index, re.compile("|".join(f"(?:{p})" for p in rest))))
+    return categories, word_index, regexes
+
+
+# Compiled once per table; detect_pattern runs them against every server.
+# The answer is still the first category in table order that matches (a
+# single regex across categories would pick the leftmost match in the
+# text instead). Matching is done on normalize_text output, which is
+# already lowercased.
+TERRAIN_PATTERNS, FRAMEWORK_PATTERNS, ERA_PATTERNS, MODE_PATTERNS = (
+    _compile_table(table)
+    for table in (TERRAIN_PATTERNS, FRAMEWORK_PATTERNS, ERA_PATTERNS, MODE_PATTERNS)
+)
+
 # Community link extraction
 DISCORD_PATTERN = re.compile(r"discord(?:\.gg|app\.com/invite)[/:\s]+([a-zA-Z0-9\-_]+)", re.IGNORECASE)
 SRS_PATTERN = re.compile(r"srs[:\s]+(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}[:\d]*)", re.IGNORECASE)
 SRS_PATTERN_ALT = re.compile(r"(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}):(\d{4,5}).*srs", re.IGNORECASE)
-QQ_PATTERN = re.compile(r"(?:qq群?|QQ群?)[：:\s]*(\d{6,12})", re.IGNORECASE)
+QQ_PATTERN = re.compile(r"qq群?[：:\s]*(\d{6,12})", re.IGNORECASE)
 WEBSITE_PATTERN = re.compile(r"https?://[^\s<>\"']+", re.IGNORECASE)
 TACVIEW_PATTERN = re.compile(r"tacview[:\s]+(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}[:\d]*)", re.IGNORECASE)
 TEAMSPEAK_PATTERN = re.compile(r"(?:ts|teamspeak)[:\s]+([a-zA-Z0-9\.\-]+(?::\d+)?)", re.IGNORECASE)
 PING_TIME_RE = re.compile(r"(?:time(?:=|<))([0-9]+(?:\.[0-9]+)?)\s*ms", re.IGNORECASE)
+SRS_WORD_PATTERN = re.compile(r"\bsrs\b", re.IGNORECASE)
+TACVIEW_WORD_PATTERN = re.compile(r"\btacview\b", re.IGNORECASE)
+# Cyrillic, hiragana/katakana, CJK ideographs, Hangul (see detect_language)
+LANGUAGE_CHAR_PATTERN = re.compile(r"[\u0400-\u04ff\u3040-\u309f\u30a0-\u30ff\u4e00-\u9fff\uac00-\ud7af]")
+
+
+# Drops the control/format characters server text actually contains (all
+# in Unicode category C). Tabs, newlines and no-break spaces become spaces,
+# which is what the whitespace collapse in normalize_text makes of them.
+_CONTROL_TABLE = dict.fromkeys([*range(0x20), *range(0x7f, 0xa0), *range(0x200b, 0x2010), 0xfeff])
+_CONTROL_TABLE.update({ord("\t"): " ", ord("\n"): " ", 0xa0: " "})
 
 
 def normalize_text(text: str) -> str:
     """Normalize text for consistent matching."""
     if not text:
         return ""
-    text = text.replace("\u00a0", " ")
-    text = "".join(ch for ch in text if unicodedata.category(ch)[0] != "C" or ch in "\n\t")
+    # isprintable() is False for every category C character (and for
+    # no-break spaces), so most strings skip both passes; the category
+    # scan only runs for characters the table does not cover
+    if not text.isprintable():
+        text = text.translate(_CONTROL_TABLE)
+        if not text.isprintable():
+            text = "".join(ch for ch in text if unicodedata.category(ch)[0] != "C")
     return " ".join(text.split()).strip().lower()
 
 
@@ -145,14 +203,35 @@ def generate_fingerprint(ip: str, port: int, name: str) -> str:
     return hashlib.sha256(data.encode("utf-8")).hexdigest()
 
 
-def detect_pattern(text: str, patterns: Dict[str, List[str]]) -> Optional[str]:
+def detect_pattern(text: str, patterns: Tuple[List[str], Dict[str, int], List[Tuple[int, re.Pattern]]]) -> Optional[str]:
     """Detect first matching pattern category."""
     text_lower = normalize_text(text)
-    for category, regexes in patterns.items():
-        for pattern in regexes:
-            if re.search(pattern, text_lower):
-                return category
-    return None
+    return _detect_normalized(text_lower, set(WORD_RE.findall(text_lower)), patterns)
+
+
+def _detect_normalized(
+    text_lower: str,
+    words: set,
+    patterns: Tuple[List[str], Dict[str, int], List[Tuple[int, re.Pattern]]],
+) -> Optional[str]:
+    """detect_pattern for text already through normalize_text, with its WORD_RE words."""
+    categories, word_index, regexes = patterns
+    # Earliest category with a literal word in the text; only regexes of
+    # categories before it can still change the answer
+    best = min((word_index[w] for w in words if w in word_index), default=len(categories))
+    for index, pattern in regexes:
+        if index >= best:
+            break
+        if pattern.search(text_lower):
+            return categories[index]
+    return categories[best] if best < len(categories) else None
+
+
+def _fold_keywords(text: str) -> str:
+    """Casefold text so that IGNORECASE keyword matches are plain substrings."""
+    # casefold() alone misses two of re's equivalences: dotless ı stays
+    # as is, and İ folds to i plus a combining dot
+    return text.casefold().replace("\u0131", "i").replace("\u0307", "")
 
 
 def extract_discord(text: str) -> Optional[str]:
@@ -176,7 +255,7 @@ def extract_srs(text: str, ip: str) -> Optional[str]:
     if match:
         return f"{match.group(1)}:{match.group(2)}"
     # Common pattern: SRS on same IP, port 5002
-    if re.search(r"\bsrs\b", text, re.IGNORECASE):
+    if SRS_WORD_PATTERN.search(text):
         return f"{ip}:5002"
     return None
 
@@ -207,7 +286,7 @@ def extract_tacview(text: str, ip: str) -> Optional[str]:
     match = TACVIEW_PATTERN.search(text)
     if match:
         return match.group(1)
-    if re.search(r"\btacview\b", text, re.IGNORECASE):
+    if TACVIEW_WORD_PATTERN.search(text):
         return f"{ip}:42674"  # Default tacview port
     return None
 
@@ -225,11 +304,22 @@ def detect_language(text: str) -> Optional[str]:
     if not text:
         return None
 
-    # Count character types
-    chinese = len(re.findall(r"[\u4e00-\u9fff]", text))
-    russian = len(re.findall(r"[\u0400-\u04ff]", text))
-    korean = len(re.findall(r"[\uac00-\ud7af]", text))
-    japanese = len(re.findall(r"[\u3040-\u309f\u30a0-\u30ff]", text))
+    # None of the scripts counted below has ASCII characters
+    if text.isascii():
+        return "english"
+
+    # Count character types: one scan collects every counted character,
+    # then each is classified by its range
+    chinese = russian = korean = japanese = 0
+    for ch in LANGUAGE_CHAR_PATTERN.findall(text):
+        if ch >= "\uac00":
+            korean += 1
+        elif ch >= "\u4e00":
+            chinese += 1
+        elif ch >= "\u3040":
+            japanese += 1
+        else:
+            russian += 1
 
     if chinese > 5:
         return "chinese"
@@ -293,24 +383,42 @@ def enrich_server(server: Dict[str, Any]) -> Dict[str, Any]:
     # Combine text for pattern matching
     combined = f"{name} {desc} {mission}"
 
+    return dict(_enrich_text(combined, ip))
+
+
+@functools.lru_cache(maxsize=8192)
+def _enrich_text(combined: str, ip: str) -> Dict[str, Any]:
+    """Enrichment for a server's combined name/description/mission text.
+
+    Cached: the result depends only on the text and the IP (the default
+    SRS/Tacview address), and a community's servers on one host often
+    repeat both. Callers get a copy (see enrich_server).
+    """
+    # Normalized and split into words once for all four pattern tables
+    text_lower = normalize_text(combined)
+    words = set(WORD_RE.findall(text_lower))
+    folded = _fold_keywords(combined)
     return {
-        "terrain": detect_pattern(combined, TERRAIN_PATTERNS),
-        "era": detect_pattern(combined, ERA_PATTERNS),
-        "game_mode": detect_pattern(combined, MODE_PATTERNS),
-        "framework": detect_pattern(combined, FRAMEWORK_PATTERNS),
+        "terrain": _detect_normalized(text_lower, words, TERRAIN_PATTERNS),
+        "era": _detect_normalized(text_lower, words, ERA_PATTERNS),
+        "game_mode": _detect_normalized(text_lower, words, MODE_PATTERNS),
+        "framework": _detect_normalized(text_lower, words, FRAMEWORK_PATTERNS),
         "language": detect_language(combined),
-        "discord_url": extract_discord(combined),
-        "srs_address": extract_srs(combined, ip),
-        "qq_group": extract_qq_group(combined),
-        "website_url": extract_website(combined),
-        "tacview_address": extract_tacview(combined, ip),
-        "teamspeak_address": extract_teamspeak(combined),
+        # Each extractor needs its keyword somewhere in the text; most
+        # servers have none of them, so a substring test skips the regex
+        "discord_url": extract_discord(combined) if "discord" in folded else None,
+        "srs_address": extract_srs(combined, ip) if "srs" in folded else None,
+        "qq_group": extract_qq_group(combined) if "qq" in folded else None,
+        "website_url": extract_website(combined) if "http" in folded else None,
+        "tacview_address": extract_tacview(combined, ip) if "tacview" in folded else None,
+        "teamspeak_address": extract_teamspeak(combined) if "ts" in folded or "teamspeak" in folded else None,
     }
 
 
 def load_servers(path: str) -> List[Dict[str, Any]]:
-    """Load servers from JSON file."""
-    with open(path, "r", encoding="utf-8") as f:
+    """Load servers from a JSON file, gzip-compressed if it ends in .gz."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
         return json.load(f)
 
 
@@ -366,6 +474,15 @@ def create_lineage_record(cur, current_id: str, previous_id: str, match_type: st
     return result[0] if result else None
 
 
+def _inet_text(ip: str) -> str:
+    """An address as PostgreSQL's host() prints it: no netmask, compressed
+    lowercase IPv6."""
+    try:
+        return str(ipaddress.ip_interface(ip).ip)
+    except ValueError:
+        return ip
+
+
 def upsert_servers(
     conn,
     servers: List[Dict[str, Any]],
@@ -375,176 +492,143 @@ def upsert_servers(
 ) -> Tuple[int, int, int, int]:
     """Upsert servers into database. Returns (inserted, updated, snapshots, migrations)."""
     inserted = 0
-    updated = 0
     snapshot_count = 0
     migrations_detected = 0
-    now = datetime.now(timezone.utc)
+
+    # Pings are I/O waits of up to ping_timeout each: run them concurrently,
+    # once per address
+    pings: Dict[Tuple[str, int], Optional[float]] = {}
+    if measure_latency:
+        addresses = list(dict.fromkeys(
+            (server.get("ip_address"), server.get("port") or 10308)
+            for server in servers
+            if server.get("ip_address") and server.get("server_name")
+        ))
+        with ThreadPoolExecutor(max_workers=PING_WORKERS) as executor:
+            pings = dict(zip(addresses, executor.map(
+                lambda address: measure_ping_ms(address[0], port=address[1], timeout_seconds=ping_timeout),
+                addresses,
+            )))
+
+    # One upsert row per ip/port (the stable identifier): a batch may not
+    # touch the same row twice, and row by row the last entry won anyway.
+    # Keyed on the address as the database prints it, so two spellings of
+    # one address collapse and RETURNING rows can be matched back
+    rows: Dict[Tuple[str, int], tuple] = {}
+    entries: List[Tuple[Tuple[str, int], Dict[str, Any], str, Optional[float]]] = []
+    for server in servers:
+        ip = server.get("ip_address")
+        port = server.get("port") or 10308
+        name = server.get("server_name")
+
+        if not ip or not name:
+            continue
+
+        fingerprint = generate_fingerprint(ip, port, name)
+        enrichment = enrich_server(server)
+        key = (_inet_text(ip), int(port))
+        ping_ms = pings[(ip, port)] if measure_latency else server.get("ping_ms")
+        rows[key] = (
+            fingerprint, name, ip, port,
+            server.get("players_current"), server.get("players_max"), server.get("password_required"),
+            server.get("dcs_version"), server.get("mission"), server.get("mission_time_seconds"), server.get("description"),
+            ping_ms,
+            enrichment["terrain"], enrichment["era"], enrichment["game_mode"], enrichment["framework"], enrichment["language"],
+            enrichment["discord_url"], enrichment["srs_address"], enrichment["qq_group"], enrichment["website_url"],
+            enrichment["tacview_address"], enrichment["teamspeak_address"],
+        )
+        entries.append((key, server, name, ping_ms))
+
+    if not rows:
+        return 0, 0, 0, 0
 
     with conn.cursor() as cur:
-        for server in servers:
-            ip = server.get("ip_address")
-            port = server.get("port") or 10308
-            name = server.get("server_name")
-
-            if not ip or not name:
-                continue
-
-            fingerprint = generate_fingerprint(ip, port, name)
-            enrichment = enrich_server(server)
-            ping_ms = server.get("ping_ms")
-            if measure_latency:
-                ping_ms = measure_ping_ms(ip, port=port, timeout_seconds=ping_timeout)
-
-            # Check if server exists by IP+port (the stable identifier)
-            cur.execute("SELECT id FROM servers WHERE ip_address = %s::inet AND port = %s", (ip, port))
-            existing = cur.fetchone()
-
-            if existing:
-                # Update existing server
-                server_id = existing[0]
-                cur.execute("""
-                    UPDATE servers SET
-                        fingerprint = %s,
-                        server_name = %s,
-                        players_current = %s,
-                        players_max = %s,
-                        password_required = %s,
-                        dcs_version = %s,
-                        mission = %s,
-                        mission_time_secs = %s,
-                        description = %s,
-                        ping_ms = %s,
-                        terrain = COALESCE(%s, terrain),
-                        era = COALESCE(%s, era),
-                        game_mode = COALESCE(%s, game_mode),
-                        framework = COALESCE(%s, framework),
-                        language = COALESCE(%s, language),
-                        discord_url = COALESCE(%s, discord_url),
-                        srs_address = COALESCE(%s, srs_address),
-                        qq_group = COALESCE(%s, qq_group),
-                        website_url = COALESCE(%s, website_url),
-                        tacview_address = COALESCE(%s, tacview_address),
-                        teamspeak_address = COALESCE(%s, teamspeak_address),
-                        last_seen = %s,
-                        last_enriched = %s
-                    WHERE id = %s
-                """, (
-                    fingerprint,
-                    name,
-                    server.get("players_current"),
-                    server.get("players_max"),
-                    server.get("password_required"),
-                    server.get("dcs_version"),
-                    server.get("mission"),
-                    server.get("mission_time_seconds"),
-                    server.get("description"),
-                    ping_ms,
-                    enrichment["terrain"],
-                    enrichment["era"],
-                    enrichment["game_mode"],
-                    enrichment["framework"],
-                    enrichment["language"],
-                    enrichment["discord_url"],
-                    enrichment["srs_address"],
-                    enrichment["qq_group"],
-                    enrichment["website_url"],
-                    enrichment["tacview_address"],
-                    enrichment["teamspeak_address"],
-                    now,
-                    now,
-                    server_id,
-                ))
-                updated += 1
-            else:
-                # Insert new server (or update if ip/port exists with different fingerprint)
-                cur.execute("""
-                    INSERT INTO servers (
-                        fingerprint, server_name, ip_address, port,
-                        players_current, players_max, password_required,
-                        dcs_version, mission, mission_time_secs, description, ping_ms,
-                        terrain, era, game_mode, framework, language,
-                        discord_url, srs_address, qq_group, website_url,
-                        tacview_address, teamspeak_address,
-                        first_seen, last_seen, last_enriched
-                    ) VALUES (
-                        %s, %s, %s::inet, %s,
-                        %s, %s, %s,
-                        %s, %s, %s, %s,
-                        %s,
-                        %s, %s, %s, %s, %s,
-                        %s, %s, %s, %s,
-                        %s, %s,
-                        %s, %s, %s
-                    )
-                    ON CONFLICT (ip_address, port) DO UPDATE SET
-                        fingerprint = EXCLUDED.fingerprint,
-                        server_name = EXCLUDED.server_name,
-                        players_current = EXCLUDED.players_current,
-                        players_max = EXCLUDED.players_max,
-                        password_required = EXCLUDED.password_required,
-                        dcs_version = EXCLUDED.dcs_version,
-                        mission = EXCLUDED.mission,
-                        mission_time_secs = EXCLUDED.mission_time_secs,
-                        description = EXCLUDED.description,
-                        ping_ms = EXCLUDED.ping_ms,
-                        terrain = COALESCE(EXCLUDED.terrain, servers.terrain),
-                        era = COALESCE(EXCLUDED.era, servers.era),
-                        game_mode = COALESCE(EXCLUDED.game_mode, servers.game_mode),
-                        framework = COALESCE(EXCLUDED.framework, servers.framework),
-                        language = COALESCE(EXCLUDED.language, servers.language),
-                        discord_url = COALESCE(EXCLUDED.discord_url, servers.discord_url),
-                        srs_address = COALESCE(EXCLUDED.srs_address, servers.srs_address),
-                        qq_group = COALESCE(EXCLUDED.qq_group, servers.qq_group),
-                        website_url = COALESCE(EXCLUDED.website_url, servers.website_url),
-                        tacview_address = COALESCE(EXCLUDED.tacview_address, servers.tacview_address),
-                        teamspeak_address = COALESCE(EXCLUDED.teamspeak_address, servers.teamspeak_address),
-                        last_seen = EXCLUDED.last_seen,
-                        last_enriched = EXCLUDED.last_enriched
-                    RETURNING id, (xmax = 0) AS inserted
-                """, (
-                    fingerprint, name, ip, port,
-                    server.get("players_current"), server.get("players_max"), server.get("password_required"),
-                    server.get("dcs_version"), server.get("mission"), server.get("mission_time_seconds"), server.get("description"),
-                    ping_ms,
-                    enrichment["terrain"], enrichment["era"], enrichment["game_mode"], enrichment["framework"], enrichment["language"],
-                    enrichment["discord_url"], enrichment["srs_address"], enrichment["qq_group"], enrichment["website_url"],
-                    enrichment["tacview_address"], enrichment["teamspeak_address"],
-                    now, now, now,
-                ))
-                result = cur.fetchone()
-                server_id = result[0]
-                if result[1]:  # was actually inserted
-                    inserted += 1
-                    # Check for potential migration from another IP
-                    migration = detect_server_migration(cur, server_id, name, ip)
-                    if migration:
-                        prev_id, match_type, similarity = migration
-                        status = create_lineage_record(cur, server_id, prev_id, match_type, similarity)
-                        if status:
-                            migrations_detected += 1
-                else:  # was updated due to conflict
-                    updated += 1
-
-            # Create snapshot if requested
-            if create_snapshots:
+        # RETURNING order is not guaranteed, so each result carries its
+        # address and is matched back to its row by key. Timestamps are
+        # the database's NOW(): the transaction start, so one value for
+        # every row and snapshot of this ingest.
+        results = execute_values(cur, """
+            INSERT INTO servers (
+                fingerprint, server_name, ip_address, port,
+                players_current, players_max, password_required,
+                dcs_version, mission, mission_time_secs, description, ping_ms,
+                terrain, era, game_mode, framework, language,
+                discord_url, srs_address, qq_group, website_url,
+                tacview_address, teamspeak_address,
+                first_seen, last_seen, last_enriched
+            ) VALUES %s
+            ON CONFLICT (ip_address, port) DO UPDATE SET
+                fingerprint = EXCLUDED.fingerprint,
+                server_name = EXCLUDED.server_name,
+                players_current = EXCLUDED.players_current,
+                players_max = EXCLUDED.players_max,
+                password_required = EXCLUDED.password_required,
+                dcs_version = EXCLUDED.dcs_version,
+                mission = EXCLUDED.mission,
+                mission_time_secs = EXCLUDED.mission_time_secs,
+                description = EXCLUDED.description,
+                ping_ms = EXCLUDED.ping_ms,
+                terrain = COALESCE(EXCLUDED.terrain, servers.terrain),
+                era = COALESCE(EXCLUDED.era, servers.era),
+                game_mode = COALESCE(EXCLUDED.game_mode, servers.game_mode),
+                framework = COALESCE(EXCLUDED.framework, servers.framework),
+                language = COALESCE(EXCLUDED.language, servers.language),
+                discord_url = COALESCE(EXCLUDED.discord_url, servers.discord_url),
+                srs_address = COALESCE(EXCLUDED.srs_address, servers.srs_address),
+                qq_group = COALESCE(EXCLUDED.qq_group, servers.qq_group),
+                website_url = COALESCE(EXCLUDED.website_url, servers.website_url),
+                tacview_address = COALESCE(EXCLUDED.tacview_address, servers.tacview_address),
+                teamspeak_address = COALESCE(EXCLUDED.teamspeak_address, servers.teamspeak_address),
+                last_seen = EXCLUDED.last_seen,
+                last_enriched = EXCLUDED.last_enriched
+            RETURNING host(ip_address), port, id, (xmax = 0) AS inserted
+        """, list(rows.values()),
+            template="(%s, %s, %s::inet, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW(), NOW(), NOW())",
+            page_size=500,
+            fetch=True,
+        )
+
+        returned = {(host, port): (server_id, was_inserted) for host, port, server_id, was_inserted in results}
+
+        server_ids: Dict[Tuple[str, int], Any] = {}
+        for key, row in rows.items():
+            server_id, was_inserted = returned[key]
+            server_ids[key] = server_id
+            if was_inserted:
+                inserted += 1
+                # Check for potential migration from another IP
+                migration = detect_server_migration(cur, server_id, row[1], key[0])
+                if migration:
+                    prev_id, match_type, similarity = migration
+                    status = create_lineage_record(cur, server_id, prev_id, match_type, similarity)
+                    if status:
+                        migrations_detected += 1
+
+        # Create snapshots if requested, one per entry as before
+        if create_snapshots:
+            snapshot_rows = []
+            for key, server, name, ping_ms in entries:
                 content = f"{server.get('players_current')}|{server.get('mission')}|{server.get('dcs_version')}"
                 content_hash = hashlib.md5(content.encode()).hexdigest()
-
-                cur.execute("""
-                    INSERT INTO server_snapshots (
-                        server_id, captured_at, server_name, players_current, players_max,
-                        mission, mission_time_secs, dcs_version, is_online, ping_ms, content_hash
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, (
-                    server_id, now, name,
+                snapshot_rows.append((
+                    server_ids[key], name,
                     server.get("players_current"), server.get("players_max"),
                     server.get("mission"), server.get("mission_time_seconds"),
                     server.get("dcs_version"), True, ping_ms, content_hash,
                 ))
-                snapshot_count += 1
+
+            execute_values(cur, """
+                INSERT INTO server_snapshots (
+                    server_id, captured_at, server_name, players_current, players_max,
+                    mission, mission_time_secs, dcs_version, is_online, ping_ms, content_hash
+                ) VALUES %s
+            """, snapshot_rows, template="(%s, NOW(), %s, %s, %s, %s, %s, %s, %s, %s, %s)", page_size=500)
+            snapshot_count = len(snapshot_rows)
 
         conn.commit()
 
+    # Every entry past its address's first insert counts as an update, as row by row
+    updated = len(entries) - inserted
     return inserted, updated, snapshot_count, migrations_detected
 
 
@@ -577,6 +661,72 @@ def update_host_clusters(conn) -> int:
         return len(cluster_ids)
 
 
+def update_server_metrics(conn) -> int:
+    """Recompute per-server snapshot metrics and store them on the servers row.
+
+    Runs one aggregate over the last 30 days of snapshots so the API can
+    read trend, uptime, averages, peak and rank as plain columns.
+    """
+    with conn.cursor() as cur:
+        cur.execute("""
+            WITH runs AS (
+                SELECT COUNT(DISTINCT captured_at) as runs_7d
+                FROM server_snapshots
+                WHERE captured_at >= NOW() - INTERVAL '7 days'
+            ),
+            agg AS (
+                SELECT
+                    server_id,
+                    AVG(players_current) FILTER (
+                        WHERE captured_at >= NOW() - INTERVAL '7 days'
+                    ) as avg_7d,
+                    AVG(players_current) FILTER (
+                        WHERE captured_at < NOW() - INTERVAL '7 days'
+                          AND captured_at >= NOW() - INTERVAL '14 days'
+                    ) as avg_prev_7d,
+                    AVG(players_current) as avg_30d,
+                    COUNT(*) FILTER (
+                        WHERE captured_at >= NOW() - INTERVAL '7 days' AND is_online
+                    ) as online_7d,
+                    MAX(players_current) as peak,
+                    (ARRAY_AGG(captured_at ORDER BY players_current DESC, captured_at DESC))[1] as peak_at
+                FROM server_snapshots
+                WHERE captured_at >= NOW() - INTERVAL '30 days'
+                GROUP BY server_id
+            ),
+            metrics AS (
+                SELECT
+                    agg.*,
+                    ROUND(100.0 * online_7d / NULLIF(runs.runs_7d, 0), 1) as uptime,
+                    RANK() OVER (ORDER BY avg_7d DESC NULLS LAST) as new_rank
+                FROM agg CROSS JOIN runs
+            )
+            UPDATE servers s SET
+                avg_players_7d = ROUND(m.avg_7d, 2),
+                avg_players_30d = ROUND(m.avg_30d, 2),
+                trend_7d = ROUND(100.0 * (m.avg_7d - m.avg_prev_7d) / NULLIF(m.avg_prev_7d, 0), 1),
+                uptime_7d = m.uptime,
+                peak_players = m.peak,
+                peak_time_utc = m.peak_at,
+                rank_change = s.rank - m.new_rank,
+                rank = m.new_rank
+            FROM metrics m
+            WHERE s.id = m.server_id
+        """)
+        updated = cur.rowcount
+
+        conn.commit()
+        return updated
+
+
+def refresh_activity_stats(conn) -> None:
+    """Refresh the server_activity_stats materialized view from snapshot history."""
+    with conn.cursor() as cur:
+        # CONCURRENTLY keeps the view readable by the API during the refresh
+        cur.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY server_activity_stats")
+        conn.commit()
+
+
 def update_ecosystem_stats(conn) -> None:
     """Calculate and store ecosystem-wide statistics."""
     now = datetime.now(timezone.utc)
@@ -667,12 +817,28 @@ def main() -> int:
         clusters = update_host_clusters(conn)
         print(f"  Host clusters: {clusters}")
 
+        # Refresh denormalized per-server metrics from snapshot history
+        if args.snapshot:
+            print("Updating server metrics...")
+            metrics = update_server_metrics(conn)
+            print(f"  Servers with metrics: {metrics}")
+
+            print("Refreshing activity patterns...")
+            refresh_activity_stats(conn)
+            print("  Done")
+
         # Update ecosystem stats
         if args.stats or args.snapshot:
             print("Updating ecosystem stats...")
             update_ecosystem_stats(conn)
             print("  Done")
 
+        # Tell running API workers to refresh their cached stats and responses;
+        # NOTIFY is only delivered once the transaction commits
+        with conn.cursor() as cur:
+            cur.execute("NOTIFY snapshot_done")
+        conn.commit()
+
         # Summary
         if args.verbose:
             with conn.cursor() as cur:
@@ -65,6 +65,49 @@ CREATE TABLE IF NOT EXISTS servers (
     CONSTRAINT uq_servers_ip_port UNIQUE (ip_address, port)
 );
 
+-- Full-text document for /api/search, kept up to date by PostgreSQL itself
+ALTER TABLE servers ADD COLUMN IF NOT EXISTS search_tsv TSVECTOR
+    GENERATED ALWAYS AS (to_tsvector('english', server_name || ' ' || COALESCE(description, ''))) STORED;
+
+-- Pre-serialized ServerSummary payload for the /api/servers list, rebuilt
+-- on every write so the API can stream it without assembling rows
+ALTER TABLE servers ADD COLUMN IF NOT EXISTS summary_json JSONB;
+
+CREATE OR REPLACE FUNCTION servers_build_summary_json() RETURNS trigger AS $$
+BEGIN
+    NEW.summary_json := jsonb_build_object(
+        'id', NEW.id::text,
+        'server_name', NEW.server_name,
+        'ip_address', NEW.ip_address::text,
+        'port', NEW.port,
+        'players_current', NEW.players_current,
+        'players_max', NEW.players_max,
+        'password_required', NEW.password_required,
+        'terrain', NEW.terrain,
+        'era', NEW.era,
+        'game_mode', NEW.game_mode,
+        'framework', NEW.framework,
+        'ping_ms', NEW.ping_ms,
+        'discord_url', NEW.discord_url,
+        'srs_address', NEW.srs_address,
+        'mission', NEW.mission,
+        'dcs_version', NEW.dcs_version,
+        'trend_7d', NEW.trend_7d,
+        'health_score', NEW.health_score,
+        'last_seen', NEW.last_seen
+    );
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_servers_summary_json ON servers;
+CREATE TRIGGER trg_servers_summary_json
+    BEFORE INSERT OR UPDATE ON servers
+    FOR EACH ROW EXECUTE FUNCTION servers_build_summary_json();
+
+-- Backfill rows written before the trigger existed
+UPDATE servers SET id = id WHERE summary_json IS NULL;
+
 CREATE TABLE IF NOT EXISTS server_snapshots (
     id BIGSERIAL PRIMARY KEY,
     server_id UUID NOT NULL REFERENCES servers(id) ON DELETE CASCADE,
@@ -82,6 +125,14 @@ CREATE TABLE IF NOT EXISTS server_snapshots (
     CONSTRAINT uq_server_snapshots_server_time UNIQUE (server_id, captured_at)
 );
 
+-- Local (US Eastern) day and hour of each snapshot for the activity
+-- pattern and heatmap aggregations; dow_et is ISO-based, 0=Monday ... 6=Sunday
+ALTER TABLE server_snapshots
+    ADD COLUMN IF NOT EXISTS dow_et SMALLINT
+        GENERATED ALWAYS AS ((EXTRACT(ISODOW FROM captured_at AT TIME ZONE 'America/New_York') - 1)::smallint) STORED,
+    ADD COLUMN IF NOT EXISTS hour_et SMALLINT
+        GENERATED ALWAYS AS (EXTRACT(HOUR FROM captured_at AT TIME ZONE 'America/New_York')::smallint) STORED;
+
 CREATE TABLE IF NOT EXISTS ecosystem_stats (
     id BIGSERIAL PRIMARY KEY,
     captured_at TIMESTAMPTZ NOT NULL,
@@ -115,22 +166,147 @@ CREATE TABLE IF NOT EXISTS server_lineage (
     CONSTRAINT uq_server_lineage_pair UNIQUE (current_server_id, previous_server_id)
 );
 
-CREATE INDEX IF NOT EXISTS idx_servers_players_current ON servers(players_current DESC);
-CREATE INDEX IF NOT EXISTS idx_servers_last_seen ON servers(last_seen DESC);
-CREATE INDEX IF NOT EXISTS idx_servers_framework ON servers(framework);
-CREATE INDEX IF NOT EXISTS idx_servers_terrain ON servers(terrain);
-CREATE INDEX IF NOT EXISTS idx_servers_game_mode ON servers(game_mode);
-CREATE INDEX IF NOT EXISTS idx_servers_era ON servers(era);
+-- Sort keys are (col DESC NULLS LAST), matching the API's ORDER BY clauses
+-- (a plain DESC index is NULLS FIRST and cannot serve them). Scanned
+-- backwards, the same index serves the ASC NULLS FIRST variant.
+DROP INDEX IF EXISTS idx_servers_players_current;
+DROP INDEX IF EXISTS idx_servers_last_seen;
+DROP INDEX IF EXISTS idx_servers_trend_7d;
+DROP INDEX IF EXISTS idx_servers_health_score;
+DROP INDEX IF EXISTS idx_servers_avg_players_7d;
+CREATE INDEX IF NOT EXISTS idx_servers_players_desc ON servers(players_current DESC NULLS LAST);
+CREATE INDEX IF NOT EXISTS idx_servers_password_players ON servers(players_current DESC NULLS LAST) WHERE password_required;
+-- Only populated servers: keeps the live-stats fallback's active/solo/
+-- multiplayer counts and min_players filters on a small index. The higher
+-- statistics target gives the planner a full histogram of player counts,
+-- which are heavily skewed toward 0.
+CREATE INDEX IF NOT EXISTS idx_servers_players_active ON servers(players_current) WHERE players_current > 0;
+ALTER TABLE servers ALTER COLUMN players_current SET STATISTICS 1000;
+-- Full (not partial) so both /api/servers sorting and the leaderboard's
+-- IS NOT NULL variant can walk them and stop at the LIMIT
+CREATE INDEX IF NOT EXISTS idx_servers_trend_desc ON servers(trend_7d DESC NULLS LAST);
+CREATE INDEX IF NOT EXISTS idx_servers_health_desc ON servers(health_score DESC NULLS LAST);
+CREATE INDEX IF NOT EXISTS idx_servers_avg_players_7d_desc ON servers(avg_players_7d DESC NULLS LAST);
+CREATE INDEX IF NOT EXISTS idx_servers_last_seen_desc ON servers(last_seen DESC NULLS LAST);
+CREATE INDEX IF NOT EXISTS idx_servers_name_desc ON servers(server_name DESC NULLS LAST);
+CREATE INDEX IF NOT EXISTS idx_servers_ping_desc ON servers(ping_ms DESC NULLS LAST);
+-- Equality filter + default players sort, so a filtered page is read in
+-- order. players_current in the key also lets the framework/terrain
+-- breakdowns run as index-only scans.
+DROP INDEX IF EXISTS idx_servers_framework;
+DROP INDEX IF EXISTS idx_servers_terrain;
+DROP INDEX IF EXISTS idx_servers_game_mode;
+DROP INDEX IF EXISTS idx_servers_era;
+DROP INDEX IF EXISTS idx_servers_framework_players;
+DROP INDEX IF EXISTS idx_servers_terrain_players;
+CREATE INDEX IF NOT EXISTS idx_servers_framework_sort ON servers(framework, players_current DESC NULLS LAST) WHERE framework IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_servers_terrain_sort ON servers(terrain, players_current DESC NULLS LAST) WHERE terrain IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_servers_game_mode_sort ON servers(game_mode, players_current DESC NULLS LAST) WHERE game_mode IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_servers_era_sort ON servers(era, players_current DESC NULLS LAST) WHERE era IS NOT NULL;
 CREATE INDEX IF NOT EXISTS idx_servers_host_cluster_id ON servers(host_cluster_id);
 CREATE INDEX IF NOT EXISTS idx_servers_server_name_trgm ON servers USING gin (server_name gin_trgm_ops);
 CREATE INDEX IF NOT EXISTS idx_servers_description_trgm ON servers USING gin (description gin_trgm_ops);
-CREATE INDEX IF NOT EXISTS idx_servers_search_tsv ON servers USING gin (to_tsvector('english', server_name || ' ' || COALESCE(description, '')));
+DROP INDEX IF EXISTS idx_servers_search_tsv;
+CREATE INDEX IF NOT EXISTS idx_servers_search_tsv_col ON servers USING gin (search_tsv);
+
+ANALYZE servers;
 
-CREATE INDEX IF NOT EXISTS idx_server_snapshots_server_time ON server_snapshots(server_id, captured_at DESC);
+-- Covers the history endpoint's projection so it runs as an index-only scan
+DROP INDEX IF EXISTS idx_server_snapshots_server_time;
+CREATE INDEX IF NOT EXISTS idx_server_snapshots_server_time_covering ON server_snapshots(server_id, captured_at DESC)
+    INCLUDE (players_current, players_max, mission, is_online, ping_ms);
 CREATE INDEX IF NOT EXISTS idx_server_snapshots_captured_at ON server_snapshots(captured_at DESC);
+-- Per-server (day, hour) groups read in order, index-only
+CREATE INDEX IF NOT EXISTS idx_server_snapshots_server_dow_hour ON server_snapshots(server_id, dow_et, hour_et)
+    INCLUDE (players_current);
 
 CREATE INDEX IF NOT EXISTS idx_host_clusters_server_count ON host_clusters(server_count DESC);
 
 CREATE INDEX IF NOT EXISTS idx_server_lineage_current ON server_lineage(current_server_id);
 CREATE INDEX IF NOT EXISTS idx_server_lineage_previous ON server_lineage(previous_server_id);
 CREATE INDEX IF NOT EXISTS idx_server_lineage_status ON server_lineage(status);
+
+-- Per-server weekly activity profile behind /api/activity-patterns. Hours
+-- are Eastern Time; days are ISO-style 0=Monday ... 6=Sunday. Refreshed by
+-- ingest_servers.py --snapshot, and recreated whenever this file is
+-- applied so definition changes take effect.
+DROP MATERIALIZED VIEW IF EXISTS server_activity_stats;
+CREATE MATERIALIZED VIEW server_activity_stats AS
+-- Grouped on (server_id, dow, hour_et) only; the descriptive server
+-- columns are joined once per server in server_summary
+WITH hourly_activity AS (
+    SELECT
+        server_id,
+        dow_et::int as dow,
+        hour_et::int as hour_et,
+        AVG(players_current) as avg_players,
+        MAX(players_current) as max_players,
+        COUNT(*) as samples
+    FROM server_snapshots
+    WHERE players_current >= 0
+    GROUP BY server_id, dow_et, hour_et
+),
+server_stats AS (
+    SELECT
+        server_id,
+        SUM(samples) as total_samples,
+        -- One hourly_activity row per (dow, hour_et) slot
+        COUNT(*) as active_hours,
+        -- Find peak hour
+        (ARRAY_AGG(dow ORDER BY avg_players DESC))[1] as peak_day,
+        (ARRAY_AGG(hour_et ORDER BY avg_players DESC))[1] as peak_hour,
+        MAX(avg_players) as peak_avg_players,
+        AVG(avg_players) as overall_avg,
+        -- Baseline: 25th percentile (server's "normal" state - dead/bot)
+        PERCENTILE_CONT(0.25) WITHIN GROUP (ORDER BY avg_players) as baseline
+    FROM hourly_activity
+    GROUP BY server_id
+),
+-- Peak window and hot slots for every server in one join + hash aggregate
+-- over hourly_activity, instead of two correlated lookups per server
+window_stats AS (
+    SELECT
+        ha.server_id,
+        -- Peak window average: peak hour ±2 hours on peak day
+        AVG(ha.avg_players) FILTER (
+            WHERE ha.dow = ss.peak_day
+              AND ha.hour_et BETWEEN ss.peak_hour - 2 AND ss.peak_hour + 2
+        ) as peak_window_avg,
+        -- Hot slots: hours where avg > baseline × 3 (relative threshold)
+        COUNT(*) FILTER (WHERE ha.avg_players > GREATEST(ss.baseline * 3, 2)) as hot_slots
+    FROM hourly_activity ha
+    JOIN server_stats ss ON ss.server_id = ha.server_id
+    GROUP BY ha.server_id
+),
+server_summary AS (
+    SELECT
+        ss.server_id,
+        s.server_name,
+        s.password_required,
+        s.terrain,
+        s.framework,
+        ss.total_samples,
+        ss.active_hours,
+        ss.peak_day,
+        ss.peak_hour,
+        ss.peak_avg_players,
+        ss.overall_avg,
+        ss.baseline,
+        -- Activity concentration score
+        ss.peak_avg_players / NULLIF(ss.overall_avg, 0) as activity_score,
+        COALESCE(ws.peak_window_avg, ss.peak_avg_players) as peak_window_avg,
+        ws.hot_slots
+    FROM server_stats ss
+    JOIN window_stats ws ON ws.server_id = ss.server_id
+    JOIN servers s ON s.id = ss.server_id
+)
+SELECT
+    *,
+    -- Training ratio: peak window vs baseline (relative, works for any squad size)
+    peak_window_avg / NULLIF(GREATEST(baseline, 0.5), 0) as training_ratio
+FROM server_summary;
+
+-- Unique index required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_server_activity_stats_server ON server_activity_stats(server_id);
+CREATE INDEX IF NOT EXISTS idx_server_activity_stats_peak ON server_activity_stats(peak_day, peak_hour);
+CREATE INDEX IF NOT EXISTS idx_server_activity_stats_training ON server_activity_stats(baseline, training_ratio DESC);